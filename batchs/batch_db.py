@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""배치 공용 MySQL 커넥션 풀 모듈.
+
+db_forecasting.py / train_model.py / update_cleaner_ranking.py가 접속 설정을 각자 만들지
+않고 프로세스 전역 ``mysql.connector.pooling`` 풀에서 커넥션을 빌린다. 본 작업
+트랜잭션(main), 에러/실행 이력 기록(log), 병렬 단계 등 용도별로 커넥션을 따로 받아서
+이력 기록이 본 트랜잭션을 커밋하거나 끊긴 커넥션을 재사용하지 않게 한다. 빌려줄 때마다
+ping으로 상태를 확인해 끊긴 커넥션은 다시 연결하고, 풀 대기 시간은 용도별로 누적해
+실행 종료 시 로그로 남긴다.
+
+환경변수
+----------------
+- DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME
+- BATCH_DB_POOL_SIZE    : 풀 크기(기본 6, 최대 32). 분산 worker(--role worker)는 main·job_queue·
+                          booking_feed 커넥션을 동시에 잡고 실패 시 log를 하나 더 빌리므로 최소 4가 필요하다.
+- BATCH_DB_POOL_TIMEOUT : 빈 커넥션을 기다리는 최대 시간(초, 기본 30)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import mysql.connector
+from mysql.connector import errors as mysql_errors
+from mysql.connector import pooling
+
+POOL_NAME = "tenaCierge_batch"
+# 동시에 빌리는 용도의 최대치(분산 worker: main + job_queue + booking_feed + log = 4)에 여유 2를 더한 값.
+POOL_SIZE = min(32, max(1, int(os.environ.get("BATCH_DB_POOL_SIZE", 6))))
+POOL_TIMEOUT = float(os.environ.get("BATCH_DB_POOL_TIMEOUT", 30))
+POOL_RETRY_INTERVAL = 0.05
+PING_ATTEMPTS = 3
+
+_pool: Optional[pooling.MySQLConnectionPool] = None
+_pool_lock = threading.Lock()
+# purpose → [대여 횟수, 누적 대기(초), 최대 대기(초), 재연결 횟수]
+_stats: Dict[str, List[float]] = {}
+_stats_lock = threading.Lock()
+
+
+def db_config() -> Dict[str, object]:
+    cfg: Dict[str, object] = dict(
+        host=os.environ.get("DB_HOST", "127.0.0.1"),
+        port=int(os.environ.get("DB_PORT", 3306)),
+        user=os.environ.get("DB_USER", "root"),
+        password=os.environ.get("DB_PASSWORD", ""),
+        database=os.environ.get("DB_NAME", "tenaCierge"),
+    )
+    if not cfg["password"]:
+        raise SystemExit(
+            "DB_PASSWORD가 설정되지 않았습니다. /srv/tenaCierge/.env.batch 등을 로딩하거나 "
+            "환경 변수(DB_HOST/DB_USER/DB_PASSWORD/DB_NAME)를 직접 지정해주세요."
+        )
+    return cfg
+
+
+def get_pool() -> pooling.MySQLConnectionPool:
+    """프로세스 전역 커넥션 풀을 반환한다(최초 호출 시 생성)."""
+
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            cfg = db_config()
+            logging.info(
+                "DB 접속 정보: %s:%s/%s (pool=%s)",
+                cfg["host"],
+                cfg["port"],
+                cfg["database"],
+                POOL_SIZE,
+            )
+            _pool = pooling.MySQLConnectionPool(
+                pool_name=POOL_NAME,
+                pool_size=POOL_SIZE,
+                pool_reset_session=True,
+                **cfg,
+            )
+        return _pool
+
+
+def _record(purpose: str, waited: float, reconnected: bool) -> None:
+    with _stats_lock:
+        entry = _stats.setdefault(purpose, [0, 0.0, 0.0, 0])
+        entry[0] += 1
+        entry[1] += waited
+        entry[2] = max(entry[2], waited)
+        entry[3] += int(reconnected)
+
+
+def get_db_connection(
+    *, autocommit: bool = False, purpose: str = "main"
+) -> pooling.PooledMySQLConnection:
+    """풀에서 상태 확인을 마친 커넥션을 빌린다. ``close()``하면 풀로 돌아간다.
+
+    purpose: main(본 작업 트랜잭션) / log(에러·실행 이력) / 병렬 단계 이름 등 통계 구분용.
+    빈 커넥션이 없으면 ``BATCH_DB_POOL_TIMEOUT``초까지 기다린 뒤 PoolError를 올린다.
+    """
+
+    pool = get_pool()
+    started = time.monotonic()
+    while True:
+        try:
+            conn = pool.get_connection()
+            break
+        except mysql_errors.PoolError:
+            if time.monotonic() - started >= POOL_TIMEOUT:
+                raise
+            time.sleep(POOL_RETRY_INTERVAL)
+    waited = time.monotonic() - started
+
+    reconnected = False
+    try:
+        try:
+            conn.ping()
+        except mysql.connector.Error:
+            reconnected = True
+            conn.reconnect(attempts=PING_ATTEMPTS, delay=1)
+        # 풀 반환 시 세션이 초기화되므로(pool_reset_session) 빌릴 때마다 세션 값을 다시 정한다.
+        with conn.cursor() as cur:
+            cur.execute(f"SET autocommit = {int(autocommit)}")
+    except mysql.connector.Error:
+        conn.close()
+        raise
+    _record(purpose, waited, reconnected)
+    if reconnected:
+        logging.info("DB 커넥션 재연결(%s)", purpose)
+    return conn
+
+
+def pool_stats() -> Dict[str, Dict[str, float]]:
+    with _stats_lock:
+        return {
+            purpose: {
+                "acquired": int(entry[0]),
+                "wait_total": entry[1],
+                "wait_max": entry[2],
+                "reconnected": int(entry[3]),
+            }
+            for purpose, entry in _stats.items()
+        }
+
+
+def log_pool_stats(app_name: str) -> None:
+    stats = pool_stats()
+    if not stats:
+        return
+    logging.info(
+        "DB 풀 통계(%s): %s",
+        app_name,
+        ", ".join(
+            f"{purpose} {entry['acquired']}회(대기 합계 {entry['wait_total']:.3f}s, "
+            f"최대 {entry['wait_max']:.3f}s, 재연결 {entry['reconnected']}회)"
+            for purpose, entry in sorted(stats.items())
+        ),
+    )
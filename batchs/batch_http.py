@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""배치 공용 HTTP 세션 모듈.
+
+db_forecasting.py / update_cleaner_ranking.py 등 배치 스크립트가 호출하는 모든 HTTP
+요청(ICS 다운로드, 웹푸시 enqueue, OpenAI API)이 하나의 ``requests.Session``을
+공유하도록 한다. 호스트별 커넥션 풀과 keep-alive로 TCP/TLS 재연결을 줄이고,
+gzip 응답을 요청하며, 실행 종료 시 커넥션 재사용 통계를 로그로 남긴다.
+
+환경변수
+----------------
+- BATCH_HTTP_CONNECT_TIMEOUT : 연결 타임아웃(초, 기본 5)
+- BATCH_HTTP_POOL_HOSTS      : 풀을 유지할 호스트 수(기본 32)
+- BATCH_HTTP_POOL_SIZE       : 호스트당 유지 커넥션 수(기본 16)
+- WEB_PUSH_SCENARIO_ENDPOINT : 웹푸시 시나리오 enqueue API 주소
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CONNECT_TIMEOUT = float(os.environ.get("BATCH_HTTP_CONNECT_TIMEOUT", 5))
+POOL_HOSTS = int(os.environ.get("BATCH_HTTP_POOL_HOSTS", 32))
+POOL_SIZE = int(os.environ.get("BATCH_HTTP_POOL_SIZE", 16))
+
+WEB_PUSH_SCENARIO_URL = os.environ.get(
+    "WEB_PUSH_SCENARIO_ENDPOINT", "http://localhost:3200/api/push/scenario"
+)
+
+_session: Optional[requests.Session] = None
+_adapter: Optional["_CountingAdapter"] = None
+_session_lock = threading.Lock()
+
+
+class _CountingAdapter(HTTPAdapter):
+    """풀에서 밀려난(evict) 커넥션 풀의 통계까지 누적하는 어댑터."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        self.retired_connections = 0
+        self.retired_requests = 0
+        self._stats_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        pools = self.poolmanager.pools
+        original_dispose = pools.dispose_func
+
+        def _dispose(pool) -> None:
+            with self._stats_lock:
+                self.retired_connections += getattr(pool, "num_connections", 0)
+                self.retired_requests += getattr(pool, "num_requests", 0)
+            if original_dispose:
+                original_dispose(pool)
+
+        pools.dispose_func = _dispose
+
+    def stats(self) -> Tuple[int, int]:
+        connections = self.retired_connections
+        request_count = self.retired_requests
+        pools = self.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += getattr(pool, "num_connections", 0)
+            request_count += getattr(pool, "num_requests", 0)
+        return connections, request_count
+
+
+def get_session() -> requests.Session:
+    """프로세스 전역 HTTP 세션을 반환한다(최초 호출 시 생성)."""
+
+    global _session, _adapter
+    with _session_lock:
+        if _session is None:
+            adapter = _CountingAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(
+                {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+            )
+            _session, _adapter = session, adapter
+        return _session
+
+
+def http_timeout(read_timeout: float) -> Tuple[float, float]:
+    """(connect, read) 타임아웃 튜플. 연결 타임아웃은 read 값을 넘지 않는다."""
+
+    return min(CONNECT_TIMEOUT, read_timeout), read_timeout
+
+
+def connection_stats() -> Dict[str, int]:
+    if _adapter is None:
+        return {"requests": 0, "connections": 0, "reused": 0}
+    connections, request_count = _adapter.stats()
+    return {
+        "requests": request_count,
+        "connections": connections,
+        "reused": max(0, request_count - connections),
+    }
+
+
+def log_connection_stats(app_name: str) -> None:
+    stats = connection_stats()
+    if not stats["requests"]:
+        return
+    logging.info(
+        "HTTP 커넥션 통계(%s): 요청 %s건, 신규 연결 %s건, 재사용 %s건 (%.0f%%)",
+        app_name,
+        stats["requests"],
+        stats["connections"],
+        stats["reused"],
+        stats["reused"] * 100 / stats["requests"],
+    )
+
+
+def enqueue_web_push_scenario(payload: Dict[str, object], *, label: str) -> None:
+    """배치 결과를 웹푸시 시나리오 큐로 전달한다."""
+
+    logging.info(
+        "웹푸시 enqueue 시도(%s): url=%s payload=%s",
+        label,
+        WEB_PUSH_SCENARIO_URL,
+        json.dumps(payload, ensure_ascii=False),
+    )
+    try:
+        resp = get_session().post(WEB_PUSH_SCENARIO_URL, json=payload, timeout=http_timeout(5))
+    except Exception as exc:  # pylint: disable=broad-except
+        logging.warning(
+            "웹푸시 enqueue 실패(%s): url=%s error=%s", label, WEB_PUSH_SCENARIO_URL, exc
+        )
+        return
+
+    if resp.status_code >= 400:
+        logging.warning(
+            "웹푸시 enqueue 응답 오류(%s): status=%s body=%s",
+            label,
+            resp.status_code,
+            resp.text,
+        )
+        return
+
+    try:
+        data = resp.json()
+    except Exception:  # pylint: disable=broad-except
+        logging.info(
+            "웹푸시 enqueue 완료(%s) - JSON 파싱 실패: status=%s body=%s",
+            label,
+            resp.status_code,
+            resp.text,
+        )
+        return
+
+    created = data.get("created")
+    attempted = data.get("attempted")
+    if not created:
+        logging.info("웹푸시 enqueue dedup/스킵(%s): attempted=%s", label, attempted)
+    else:
+        logging.info("웹푸시 enqueue 완료(%s): created=%s attempted=%s", label, created, attempted)
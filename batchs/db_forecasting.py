@@ -19,24 +19,69 @@ DB 스키마(client_rooms, work_fore_*, work_header 등)를 직접 사용하도
 주요 CLI 옵션
 --------------
 --run-date        : 배치 기준일(기본 오늘)
+--run-date-range START END: START~END 각 기준일의 work_fore_d1/d7를 한 프로세스에서 재계산.
+                    객실·모델 조회와 ICS 다운로드(또는 --ics-source 재생)·파싱은 한 번만 하고,
+                    work_header/accuracy/apply/웹푸시는 건너뜀
+--capacity-horizon N: D+1~D+N 구역별 기대 퇴실 수·weight 합계를 work_fore_capacity(구역 × 일자)에 집계.
+                    타임라인의 확정 퇴실 + 나머지 객실의 p_out 기대값이며 work_fore/헤더/apply는 건너뜀
+--role            : 분산 모드 역할. coordinator가 활성 객실을 work_fore_job에 넣으면 여러 호스트의 worker가
+                    객실 묶음을 lease로 가져가 다운로드·예측·헤더 보정·지문 저장을 하고(만료된 lease는 재할당),
+                    reduce가 전체 완료를 기다려 비활성 객실 헤더·지문 정리·work_apply 생성·웹푸시를 한다.
+                    보조 옵션: --worker-id, --lease-rooms, --lease-seconds, --reduce-wait
+--header-insert-chunk N: work_header 신규 행을 N행씩 multi-row INSERT(기본 500)
+--commit-per-date : work_header 변경을 대상 일자별로 커밋(기본은 실행당 한 번 커밋)
 --start-offset    : run-date 기준 시작 offset (기본 1 = D+1)
 --end-offset      : run-date 기준 종료 offset (기본 7 = D+7)
---ics-keep-days   : ics 디렉터리 보관 일수(기본 3일, README 규칙 반영)
+--ics-keep-days   : ics 보관소 manifest 보관 일수(기본 3일, README 규칙 반영)
+--download-workers: ICS 병렬 다운로드 스레드 수(기본 8)
+--per-host-limit  : 동일 호스트(airbnb/booking 등) 동시 요청 상한(기본 4)
+--parse-workers   : ICS 파싱/병합 프로세스 수(0·1이면 단일 프로세스). 생략 시 ICS 400건 이상일
+                    때만 CPU 수만큼 쓰고, 그보다 적으면(--refresh-dn 소량 갱신 등) 단일 프로세스
+--full            : 객실별 타임라인 지문(work_fore_fingerprint) 비교 없이 전체 재계산.
+                    기본은 같은 기준일·offset의 재실행에서 지문·객실 속성이 바뀐 객실만 예측/헤더 보정하고,
+                    해당 구역만 apply 슬롯을 만든다(새 기준일의 첫 실행은 사실상 전체 계산)
+--ics-source      : 네트워크 대신 보관된 ICS로 재생(manifest.json / ics 폴더 / 구 timestamp 폴더).
+                    --run-date 생략 시 manifest의 기준일을 사용하고, 보관·웹푸시는 건너뜀
+--benchmark-p-out ROOMS: p_out 스칼라 계산과 (horizon, weekday) 표 조회를 비교(결과 일치·소요 시간)하고
+                    종료(DB 접속 없음, 기본 모델 변수 사용)
+--verify-ics-parser: 지정 경로(ics/blobs 등 보관 폴더/파일)의 ICS를 fast path와 icalendar로
+                    각각 파싱해 결과가 같은지 검증하고 종료(DB 접속 없음)
 """
 
 from __future__ import annotations
 
 import argparse
+import array
+import multiprocessing
 import datetime as dt
+import gzip
+import hashlib
 import json
 import logging
 import math
 import os
+import socket
+import sys
+import threading
+import time
 import traceback
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from contextlib import contextmanager
 from dataclasses import dataclass
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+from urllib.parse import urlparse
+from zoneinfo import ZoneInfo
 
 import mysql.connector
 import requests
@@ -44,14 +89,31 @@ from dateutil import tz
 from icalendar import Calendar
 import shutil
 
+from batch_db import get_db_connection, log_pool_stats
+from batch_http import (
+    enqueue_web_push_scenario,
+    get_session,
+    http_timeout,
+    log_connection_stats,
+)
+
 # ------------------------------ 상수 ------------------------------
 BASE_DIR = Path(__file__).resolve().parent
 ICS_BASE = BASE_DIR / "ics"
+ICS_HTTP_CACHE_DIR = ICS_BASE / "_http_cache"
+ICS_EVENT_CACHE_DIR = ICS_BASE / "_events"
 SEOUL = tz.gettz("Asia/Seoul")
 
-WEB_PUSH_SCENARIO_URL = os.environ.get(
-    "WEB_PUSH_SCENARIO_ENDPOINT", "http://localhost:3200/api/push/scenario"
-)
+ICS_READ_TIMEOUT = 20
+URL_HEALTH_PATH = ICS_BASE / "url_health.json"
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_PROBE_TIMEOUT = 3
+ADAPTIVE_TIMEOUT_MIN = 5
+ADAPTIVE_TIMEOUT_FACTOR = 3
+LATENCY_SAMPLE_SIZE = 20
+LATENCY_MIN_SAMPLES = 5
+SLOW_URL_P95 = 10
+URL_HEALTH_RETENTION_DAYS = 30
 
 WEEKDAY_BASE = {0: 0.6, 1: 0.45, 2: 0.45, 3: 0.5, 4: 0.8, 5: 1.0, 6: 0.9}
 WEEKDAY_FACTOR = {0: 0.95, 1: 0.90, 2: 0.90, 3: 0.95, 4: 1.00, 5: 1.05, 6: 1.00}
@@ -66,9 +128,40 @@ DEFAULT_MODEL = {
     "borderline": 0.40,
 }
 
-D1_PRECISION_TARGET = 0.70
-D1_HIGH_STEP = 0.02
-D1_HIGH_MIN, D1_HIGH_MAX = 0.40, 0.90
+DEFAULT_DOWNLOAD_WORKERS = 8
+DEFAULT_PER_HOST_LIMIT = 4
+DEFAULT_PARSE_WORKERS = os.cpu_count() or 1
+# --parse-workers 생략 시 프로세스 풀을 띄우는 최소 ICS 건수(spawn마다 import 비용이 든다)
+PARSE_POOL_MIN_ICS = 400
+PARSE_QUEUE_PER_WORKER = 4
+SINK_BATCH_ROOMS = 200
+HEADER_INSERT_CHUNK = 500
+HEADER_INSERT_ROW = (
+    "(%s, %s, NULL, NULL, %s, %s, %s, %s, %s, %s, 0, 1, NULL, NULL, %s, 0, 0, %s, %s)"
+)
+# (date, room_id)가 이미 있으면(만료된 lease를 다른 worker가 다시 처리한 경우 등) 수정 규칙과 같이
+# 예측 항목만 덮어쓰고, 수동 수정 행은 그대로 둔다.
+HEADER_INSERT_UPSERT = """
+ON DUPLICATE KEY UPDATE
+    amenities_qty = IF(manual_upt_yn = 1, amenities_qty, VALUES(amenities_qty)),
+    blanket_qty = IF(manual_upt_yn = 1, blanket_qty, VALUES(blanket_qty)),
+    condition_check_yn = IF(manual_upt_yn = 1, condition_check_yn, VALUES(condition_check_yn)),
+    cleaning_yn = IF(manual_upt_yn = 1, cleaning_yn, VALUES(cleaning_yn)),
+    checkin_time = IF(manual_upt_yn = 1, checkin_time, VALUES(checkin_time)),
+    checkout_time = IF(manual_upt_yn = 1, checkout_time, VALUES(checkout_time)),
+    requirements = IF(manual_upt_yn = 1, requirements, VALUES(requirements)),
+    cancel_yn = IF(manual_upt_yn = 1, cancel_yn, 0),
+    updated_by = IF(manual_upt_yn = 1, updated_by, VALUES(updated_by))
+"""
+FORE_WRITE_ROWS = 5000
+MAX_RUN_DATE_RANGE_DAYS = 366
+MAX_CAPACITY_HORIZON = 365
+DEFAULT_LEASE_ROOMS = 200
+DEFAULT_LEASE_SECONDS = 600
+DEFAULT_REDUCE_WAIT = 600
+JOB_MAX_ATTEMPTS = 3
+JOB_POLL_SECONDS = 15
+
 
 MODEL_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS model_variable (
@@ -80,6 +173,97 @@ CREATE TABLE IF NOT EXISTS model_variable (
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 """
 
+FINGERPRINT_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS work_fore_fingerprint (
+    `room_id` INT UNSIGNED NOT NULL PRIMARY KEY,
+    `basecode_sector` VARCHAR(10) NULL,
+    `run_dttm` DATE NOT NULL,
+    `fingerprint` CHAR(40) NOT NULL,
+    `updated_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+"""
+
+BOOKING_INTERVAL_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS work_booking_interval (
+    `room_id` INT UNSIGNED NOT NULL,
+    `start_dttm` DATETIME NOT NULL,
+    `end_dttm` DATETIME NOT NULL,
+    `first_seen_date` DATE NOT NULL,
+    `updated_date` DATE NOT NULL,
+    PRIMARY KEY (`room_id`, `start_dttm`),
+    KEY `idx_booking_interval_end` (`end_dttm`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+"""
+
+BOOKING_DELTA_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS work_booking_delta (
+    `id` BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    `run_at` DATETIME NOT NULL,
+    `run_date` DATE NOT NULL,
+    `room_id` INT UNSIGNED NOT NULL,
+    `change_type` ENUM('insert', 'extend', 'cancel') NOT NULL,
+    `start_dttm` DATETIME NULL,
+    `end_dttm` DATETIME NULL,
+    `prev_start_dttm` DATETIME NULL,
+    `prev_end_dttm` DATETIME NULL,
+    `created_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    KEY `idx_booking_delta_run` (`run_at`),
+    KEY `idx_booking_delta_room` (`room_id`, `run_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+"""
+
+CAPACITY_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS work_fore_capacity (
+    `run_dttm` DATE NOT NULL,
+    `target_date` DATE NOT NULL,
+    `basecode_sector` VARCHAR(10) NOT NULL,
+    `basecode_code` VARCHAR(255) NOT NULL,
+    `horizon` SMALLINT NOT NULL,
+    `room_count` INT NOT NULL,
+    `weight_total` INT NOT NULL,
+    `confirmed_out` INT NOT NULL,
+    `confirmed_weight` INT NOT NULL,
+    `expected_out` DECIMAL(10,3) NOT NULL,
+    `expected_weight` DECIMAL(12,3) NOT NULL,
+    `created_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (`run_dttm`, `target_date`, `basecode_sector`, `basecode_code`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+"""
+
+JOB_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS work_fore_job (
+    `run_dttm` DATE NOT NULL,
+    `room_id` INT UNSIGNED NOT NULL,
+    `status` ENUM('pending', 'leased', 'done') NOT NULL DEFAULT 'pending',
+    `lease_owner` VARCHAR(100) NULL,
+    `lease_expires_at` DATETIME NULL,
+    `attempts` INT NOT NULL DEFAULT 0,
+    `updated_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (`run_dttm`, `room_id`),
+    KEY `idx_fore_job_status` (`run_dttm`, `status`, `lease_expires_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+"""
+
+FORE_STAGE_TABLE_SQL = """
+CREATE TEMPORARY TABLE IF NOT EXISTS {table} (
+    `run_dttm` DATE NOT NULL,
+    `target_date` DATE NOT NULL,
+    `room_id` INT NOT NULL,
+    `p_out` DECIMAL(4,3) NOT NULL,
+    `actual_out` TINYINT(1) NOT NULL,
+    `correct` TINYINT(1) NOT NULL,
+    PRIMARY KEY (`run_dttm`, `target_date`, `room_id`)
+)
+"""
+
+FORE_SCOPE_TABLE_SQL = """
+CREATE TEMPORARY TABLE IF NOT EXISTS tmp_work_fore_scope (
+    `room_id` INT NOT NULL PRIMARY KEY
+)
+"""
+
 
 # ------------------------------ 데이터 구조 ------------------------------
 @dataclass
@@ -135,6 +319,139 @@ class Prediction:
         )
 
 
+class PredictionBatch:
+    """객실 × offset 예측 결과를 열(column) 배열로 보관한다.
+
+    행마다 ``Prediction``/``Room`` 참조를 두지 않고 객실 색인, 대상일 ordinal, p_out,
+    플래그, 퇴실 시각(자정 기준 마이크로초, 없으면 -1)을 병렬 배열에 담는다.
+    소비자는 필요한 열만 읽고, ``Prediction``이 필요한 곳은 ``prediction(i)`` 뷰를 만든다.
+    """
+
+    POSITIVE = 1  # label "○"
+    BORDERLINE = 2  # label "△"
+    CHECKIN = 4
+    CHECKOUT = 8
+    OBSERVED = 16
+
+    __slots__ = (
+        "rooms",
+        "_room_pos",
+        "room_idx",
+        "date_ord",
+        "horizon",
+        "p_out",
+        "flags",
+        "out_us",
+    )
+
+    def __init__(self) -> None:
+        self.rooms: List[Room] = []
+        self._room_pos: Dict[int, int] = {}
+        self.room_idx = array.array("I")
+        self.date_ord = array.array("i")
+        self.horizon = array.array("h")
+        self.p_out = array.array("d")
+        self.flags = array.array("B")
+        self.out_us = array.array("q")
+
+    def __len__(self) -> int:
+        return len(self.p_out)
+
+    def append(
+        self,
+        room: Room,
+        target_date: dt.date,
+        horizon: int,
+        out_time: Optional[dt.time],
+        p_out: float,
+        label: str,
+        has_checkin: bool,
+        actual_observed: bool,
+    ) -> None:
+        pos = self._room_pos.get(room.id)
+        if pos is None:
+            pos = self._room_pos[room.id] = len(self.rooms)
+            self.rooms.append(room)
+        flags = self.POSITIVE if label == "○" else self.BORDERLINE if label == "△" else 0
+        if has_checkin:
+            flags |= self.CHECKIN
+        if out_time is not None:
+            flags |= self.CHECKOUT
+        if actual_observed:
+            flags |= self.OBSERVED
+        self.room_idx.append(pos)
+        self.date_ord.append(target_date.toordinal())
+        self.horizon.append(horizon)
+        self.p_out.append(p_out)
+        self.flags.append(flags)
+        self.out_us.append(
+            -1
+            if out_time is None
+            else ((out_time.hour * 60 + out_time.minute) * 60 + out_time.second) * 1_000_000
+            + out_time.microsecond
+        )
+
+    def room_ids(self) -> Set[int]:
+        return set(self._room_pos)
+
+    def prediction(self, i: int) -> Prediction:
+        flags = self.flags[i]
+        out_us = self.out_us[i]
+        out_time = None
+        if out_us >= 0:
+            seconds, micro = divmod(out_us, 1_000_000)
+            out_time = dt.time(seconds // 3600, seconds // 60 % 60, seconds % 60, micro)
+        return Prediction(
+            room=self.rooms[self.room_idx[i]],
+            target_date=dt.date.fromordinal(self.date_ord[i]),
+            horizon=self.horizon[i],
+            out_time=out_time,
+            p_out=self.p_out[i],
+            label="○" if flags & self.POSITIVE else "△" if flags & self.BORDERLINE else "",
+            has_checkin=bool(flags & self.CHECKIN),
+            has_checkout=bool(flags & self.CHECKOUT),
+            actual_observed=bool(flags & self.OBSERVED),
+        )
+
+    def __iter__(self) -> Iterator[Prediction]:
+        for i in range(len(self)):
+            yield self.prediction(i)
+
+    def fore_rows(self) -> Iterator[Tuple[int, dt.date, int, float, int, int]]:
+        """work_fore 저장용 (horizon, target_date, room_id, p_out, actual_out, correct)."""
+
+        dates: Dict[int, dt.date] = {}
+        for i, flags in enumerate(self.flags):
+            ordinal = self.date_ord[i]
+            target_date = dates.get(ordinal)
+            if target_date is None:
+                target_date = dates[ordinal] = dt.date.fromordinal(ordinal)
+            actual_out = correct = 0
+            if flags & self.OBSERVED:
+                actual_out = int(bool(flags & self.CHECKOUT))
+                correct = int(bool(flags & self.POSITIVE) == bool(flags & self.CHECKOUT))
+            yield (
+                self.horizon[i],
+                target_date,
+                self.rooms[self.room_idx[i]].id,
+                self.p_out[i],
+                actual_out,
+                correct,
+            )
+
+    def header_rows(self) -> Iterator[Tuple[Room, dt.date, bool, bool]]:
+        """work_header 보정용 (room, target_date, has_checkin, has_checkout)."""
+
+        for i, flags in enumerate(self.flags):
+            if flags & (self.CHECKIN | self.CHECKOUT):
+                yield (
+                    self.rooms[self.room_idx[i]],
+                    dt.date.fromordinal(self.date_ord[i]),
+                    bool(flags & self.CHECKIN),
+                    bool(flags & self.CHECKOUT),
+                )
+
+
 @dataclass
 class ApplyRule:
     min_weight: int
@@ -144,6 +461,15 @@ class ApplyRule:
     level_flag: int
 
 
+@dataclass(frozen=True)
+class IcsTask:
+    """다운로드 단위(객실 1개의 URL 1개)."""
+
+    room_id: int
+    url: str
+    filename: str
+
+
 @dataclass
 class WorkerAvailability:
     id: int
@@ -152,6 +478,14 @@ class WorkerAvailability:
     is_regular: bool
 
 
+@dataclass
+class AvailabilityCalendar:
+    """대상 기간의 worker × 일자 가용 달력."""
+
+    # 일자별 배정 가능 worker(tier>1, 근무 취소 제외, 정규 패턴 또는 추가 근무)
+    available: Dict[dt.date, List[WorkerAvailability]]
+
+
 # ------------------------------ 유틸 ------------------------------
 def configure_logging() -> None:
     log_path = BASE_DIR / "application.log"
@@ -170,51 +504,6 @@ def configure_logging() -> None:
     )
 
 
-def enqueue_web_push_scenario(payload: Dict[str, object], *, label: str) -> None:
-    """배치 결과를 웹푸시 시나리오 큐로 전달한다."""
-
-    logging.info(
-        "웹푸시 enqueue 시도(%s): url=%s payload=%s",
-        label,
-        WEB_PUSH_SCENARIO_URL,
-        json.dumps(payload, ensure_ascii=False),
-    )
-    try:
-        resp = requests.post(WEB_PUSH_SCENARIO_URL, json=payload, timeout=5)
-    except Exception as exc:  # pylint: disable=broad-except
-        logging.warning(
-            "웹푸시 enqueue 실패(%s): url=%s error=%s", label, WEB_PUSH_SCENARIO_URL, exc
-        )
-        return
-
-    if resp.status_code >= 400:
-        logging.warning(
-            "웹푸시 enqueue 응답 오류(%s): status=%s body=%s",
-            label,
-            resp.status_code,
-            resp.text,
-        )
-        return
-
-    try:
-        data = resp.json()
-    except Exception:  # pylint: disable=broad-except
-        logging.info(
-            "웹푸시 enqueue 완료(%s) - JSON 파싱 실패: status=%s body=%s",
-            label,
-            resp.status_code,
-            resp.text,
-        )
-        return
-
-    created = data.get("created")
-    attempted = data.get("attempted")
-    if not created:
-        logging.info("웹푸시 enqueue dedup/스킵(%s): attempted=%s", label, attempted)
-    else:
-        logging.info("웹푸시 enqueue 완료(%s): created=%s attempted=%s", label, created, attempted)
-
-
 def seoul_today() -> dt.date:
     """현재 서울(KST) 날짜를 반환한다."""
 
@@ -229,6 +518,62 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="배치 기준일 (기본: 오늘 KST)",
     )
+    parser.add_argument(
+        "--run-date-range",
+        nargs=2,
+        type=lambda s: dt.datetime.strptime(s, "%Y-%m-%d").date(),
+        default=None,
+        metavar=("START", "END"),
+        help="START~END 기준일의 work_fore를 한 번에 재계산(과거 이력 재구성, work_fore만 갱신)",
+    )
+    parser.add_argument(
+        "--capacity-horizon",
+        type=int,
+        default=None,
+        metavar="N",
+        help="D+1~D+N 구역별 기대 퇴실 수·weight를 work_fore_capacity에 집계(예: 90, 예측/헤더는 건너뜀)",
+    )
+    parser.add_argument(
+        "--role",
+        choices=("coordinator", "worker", "reduce"),
+        default=None,
+        help="분산 모드 역할: coordinator(객실 작업 등록) / worker(lease 처리, 여러 호스트 가능) / "
+        "reduce(완료 대기 후 헤더 정리·apply 생성). 생략 시 단일 프로세스 실행",
+    )
+    parser.add_argument(
+        "--worker-id",
+        default=f"{socket.gethostname()}:{os.getpid()}",
+        help="분산 worker 식별자(기본 호스트명:pid)",
+    )
+    parser.add_argument(
+        "--lease-rooms",
+        type=int,
+        default=DEFAULT_LEASE_ROOMS,
+        help=f"worker가 한 번에 점유할 객실 수 (기본 {DEFAULT_LEASE_ROOMS})",
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=int,
+        default=DEFAULT_LEASE_SECONDS,
+        help=f"객실 lease 유효 시간(초, 처리 중 자동 연장, 기본 {DEFAULT_LEASE_SECONDS})",
+    )
+    parser.add_argument(
+        "--reduce-wait",
+        type=int,
+        default=DEFAULT_REDUCE_WAIT,
+        help=f"reduce가 worker 완료를 기다리는 최대 시간(초, 기본 {DEFAULT_REDUCE_WAIT})",
+    )
+    parser.add_argument(
+        "--header-insert-chunk",
+        type=int,
+        default=HEADER_INSERT_CHUNK,
+        help=f"work_header 신규 행 multi-row INSERT 묶음 크기 (기본 {HEADER_INSERT_CHUNK})",
+    )
+    parser.add_argument(
+        "--commit-per-date",
+        action="store_true",
+        help="work_header 변경을 실행 끝에 한 번이 아니라 대상 일자별로 커밋",
+    )
     parser.add_argument(
         "--start-offset",
         type=int,
@@ -253,29 +598,75 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="지정한 D+n 일자에 대해 work_header만 갱신하는 경량 모드(예: --refresh-dn 1)",
     )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help=(
+            "ICS 파싱/병합 프로세스 수 (0·1이면 단일 프로세스, 생략 시 ICS "
+            f"{PARSE_POOL_MIN_ICS}건 이상일 때만 CPU 수만큼 사용)"
+        ),
+    )
+    parser.add_argument(
+        "--verify-ics-parser",
+        type=Path,
+        default=None,
+        help="ICS 파일/폴더를 fast path와 icalendar로 비교 검증하고 종료",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="지문 비교 없이 모든 객실을 다시 계산(증분 모드 해제)",
+    )
+    parser.add_argument(
+        "--ics-source",
+        type=Path,
+        default=None,
+        help="네트워크 대신 보관된 ICS(manifest 파일, ics 보관소 폴더, 구 timestamp 폴더)로 재생",
+    )
+    parser.add_argument(
+        "--benchmark-p-out",
+        type=int,
+        default=None,
+        metavar="ROOMS",
+        help="p_out 스칼라 계산과 (horizon, weekday) 표 조회를 ROOMS개 객실 규모로 비교하고 종료",
+    )
+    parser.add_argument(
+        "--download-workers",
+        type=int,
+        default=DEFAULT_DOWNLOAD_WORKERS,
+        help=f"ICS 병렬 다운로드 스레드 수 (기본 {DEFAULT_DOWNLOAD_WORKERS})",
+    )
+    parser.add_argument(
+        "--per-host-limit",
+        type=int,
+        default=DEFAULT_PER_HOST_LIMIT,
+        help=f"동일 호스트 동시 다운로드 상한 (기본 {DEFAULT_PER_HOST_LIMIT})",
+    )
     args = parser.parse_args()
+    if args.run_date_range is not None:
+        start, end = args.run_date_range
+        if start > end:
+            parser.error("--run-date-range: START가 END보다 늦습니다")
+        if (end - start).days + 1 > MAX_RUN_DATE_RANGE_DAYS:
+            parser.error(f"--run-date-range: 최대 {MAX_RUN_DATE_RANGE_DAYS}일까지 지정할 수 있습니다")
+        if args.run_date is not None or args.refresh_dn is not None:
+            parser.error("--run-date-range는 --run-date/--refresh-dn과 함께 쓸 수 없습니다")
+    if args.role is not None and (
+        args.run_date_range is not None
+        or args.refresh_dn is not None
+        or args.capacity_horizon is not None
+    ):
+        parser.error("--role은 --run-date-range/--refresh-dn/--capacity-horizon과 함께 쓸 수 없습니다")
+    if args.capacity_horizon is not None:
+        if not 1 <= args.capacity_horizon <= MAX_CAPACITY_HORIZON:
+            parser.error(f"--capacity-horizon: 1~{MAX_CAPACITY_HORIZON} 사이로 지정하세요")
+        if args.run_date_range is not None or args.refresh_dn is not None:
+            parser.error("--capacity-horizon은 --run-date-range/--refresh-dn과 함께 쓸 수 없습니다")
 
     return args
 
 
-def get_db_connection(*, autocommit: bool = False) -> mysql.connector.MySQLConnection:
-    cfg = dict(
-        host=os.environ.get("DB_HOST", "127.0.0.1"),
-        port=int(os.environ.get("DB_PORT", 3306)),
-        user=os.environ.get("DB_USER", "root"),
-        password=os.environ.get("DB_PASSWORD", ""),
-        database=os.environ.get("DB_NAME", "tenaCierge"),
-        autocommit=autocommit,
-    )
-    if not cfg["password"]:
-        raise SystemExit(
-            "DB_PASSWORD가 설정되지 않았습니다. /srv/tenaCierge/.env.batch 등을 로딩하거나 "
-            "환경 변수(DB_HOST/DB_USER/DB_PASSWORD/DB_NAME)를 직접 지정해주세요."
-        )
-    logging.info("DB 접속 정보: %s:%s/%s", cfg["host"], cfg["port"], cfg["database"])
-    return mysql.connector.connect(**cfg)
-
-
 def to_aware(value) -> dt.datetime:
     if isinstance(value, dt.datetime):
         if value.tzinfo:
@@ -286,15 +677,19 @@ def to_aware(value) -> dt.datetime:
     raise TypeError(f"지원하지 않는 타입: {type(value)!r}")
 
 
-def ensure_ics_dir() -> Path:
-    timestamp = dt.datetime.now(SEOUL).strftime("%Y%m%d%H%M%S")
-    target_dir = ICS_BASE / timestamp
-    target_dir.mkdir(parents=True, exist_ok=True)
-    logging.info("ICS 다운로드 폴더: %s", target_dir)
-    return target_dir
+def to_date(value) -> dt.date:
+    """DB의 DATE/DATETIME(또는 'YYYY-MM-DD' 문자열) 값을 date로 맞춘다."""
+
+    if isinstance(value, dt.datetime):
+        return value.date()
+    if isinstance(value, dt.date):
+        return value
+    return dt.date.fromisoformat(str(value)[:10])
 
 
 def rotate_ics_dirs(keep_days: int) -> None:
+    """보관소 도입 전 timestamp 폴더(ics/YYYYMMDDhhmmss)를 keep-days 기준으로 정리한다."""
+
     if not ICS_BASE.exists():
         return
     cutoff = dt.datetime.now(SEOUL) - dt.timedelta(days=keep_days)
@@ -326,6 +721,12 @@ def ensure_model_table(conn) -> None:
     conn.commit()
 
 
+def ensure_fingerprint_table(conn) -> None:
+    with conn.cursor() as cur:
+        cur.execute(FINGERPRINT_TABLE_SQL)
+    conn.commit()
+
+
 def load_model_variables(conn) -> Dict[str, float]:
     values = DEFAULT_MODEL.copy()
 
@@ -362,7 +763,6 @@ def save_model_variables(conn, values: Dict[str, float]) -> None:
 
 
 def log_error(
-    conn: Optional[mysql.connector.MySQLConnection],
     *,
     message: str,
     stacktrace: Optional[str] = None,
@@ -373,8 +773,11 @@ def log_error(
 ) -> None:
     """etc_errorLogs 테이블에 오류 정보를 적재한다."""
 
-    log_conn = conn if conn is not None and conn.is_connected() else get_db_connection(autocommit=True)
-    should_close = log_conn is not conn
+    try:
+        log_conn = get_db_connection(autocommit=True, purpose="log")
+    except Exception as exc:  # pragma: no cover - 실패 시 로그만 남김
+        logging.error("에러로그 저장 실패: %s", exc)
+        return
     try:
         context_json = json.dumps({"run_date": str(run_date or seoul_today())})
         with log_conn.cursor() as cur:
@@ -401,12 +804,10 @@ def log_error(
     except Exception as exc:  # pragma: no cover - 실패 시 로그만 남김
         logging.error("에러로그 저장 실패: %s", exc)
     finally:
-        if should_close:
-            log_conn.close()
+        log_conn.close()
 
 
 def log_batch_execution(
-    conn: Optional[mysql.connector.MySQLConnection],
     *,
     app_name: str,
     start_dttm: dt.datetime,
@@ -416,8 +817,11 @@ def log_batch_execution(
 ) -> None:
     """배치 실행 이력을 DB에 남긴다."""
 
-    log_conn = conn if conn is not None and conn.is_connected() else get_db_connection(autocommit=True)
-    should_close = log_conn is not conn
+    try:
+        log_conn = get_db_connection(autocommit=True, purpose="log")
+    except Exception as exc:  # pragma: no cover - 실패 시 로그만 남김
+        logging.error("배치 실행 로그 저장 실패: %s", exc)
+        return
     try:
         with log_conn.cursor() as cur:
             cur.execute(
@@ -451,11 +855,12 @@ def log_batch_execution(
     except Exception as exc:  # pragma: no cover - 실패 시 로그만 남김
         logging.error("배치 실행 로그 저장 실패: %s", exc)
     finally:
-        if should_close:
-            log_conn.close()
+        log_conn.close()
 
 
 def fetch_rooms(conn, reference_date: dt.date) -> List[Room]:
+    # ORDER BY: 같은 파일명의 충돌 suffix(_2, _3 …)가 객실 id 순으로 정해져야
+    # --ics-source로 구 timestamp 폴더를 재생할 때 파일명을 같은 객실에 다시 매핑할 수 있다.
     sql = """
         SELECT cr.id, cr.building_id, cr.room_no,
                cr.bed_count, cr.weight,
@@ -465,6 +870,7 @@ def fetch_rooms(conn, reference_date: dt.date) -> List[Room]:
         FROM client_rooms cr
         JOIN etc_buildings eb ON eb.id = cr.building_id
         WHERE cr.open_yn = 1
+        ORDER BY cr.id
     """
     with conn.cursor(dictionary=True) as cur:
         cur.execute(sql)
@@ -514,87 +920,108 @@ def fetch_apply_rules(conn) -> List[ApplyRule]:
     ]
 
 
-def fetch_sector_weights(
-    predictions: Sequence[Prediction], target_date: dt.date
-) -> List[Tuple[str, str, int]]:
-    totals: Dict[Tuple[str, str], int] = {}
-    seen_rooms: set[int] = set()
-    for pred in predictions:
-        if pred.target_date != target_date:
-            continue
-        if not pred.has_checkout:
-            continue
-        if pred.room.id in seen_rooms:
-            continue
-        seen_rooms.add(pred.room.id)
-        key = (pred.room.sector, pred.room.sector_value)
-        totals[key] = totals.get(key, 0) + pred.room.weight
-
-    return [(sector, value, weight) for (sector, value), weight in totals.items()]
-
-
 def fetch_sector_weights_from_headers(
-    conn, target_date: dt.date
-) -> List[Tuple[str, str, int]]:
-    """work_header 기반 가중치 합계를 계산한다 (cleaning only, cancel 제외)."""
+    conn, first_date: dt.date, last_date: dt.date
+) -> Dict[dt.date, List[Tuple[str, str, int]]]:
+    """work_header 기반 일자별 가중치 합계를 한 번에 계산한다 (cleaning only, cancel 제외)."""
 
     sql = """
-        SELECT eb.basecode_sector AS sector, eb.basecode_code AS code,
+        SELECT wh.date AS date, eb.basecode_sector AS sector, eb.basecode_code AS code,
                SUM(COALESCE(cr.weight, 10)) AS weight_sum
         FROM work_header wh
         JOIN client_rooms cr ON cr.id = wh.room_id
         JOIN etc_buildings eb ON eb.id = cr.building_id
-        WHERE wh.date = %s AND wh.cancel_yn = 0 AND wh.cleaning_yn = 1
-        GROUP BY eb.basecode_sector, eb.basecode_code
+        WHERE wh.date BETWEEN %s AND %s AND wh.cancel_yn = 0 AND wh.cleaning_yn = 1
+        GROUP BY wh.date, eb.basecode_sector, eb.basecode_code
+        ORDER BY wh.date, eb.basecode_sector, eb.basecode_code
     """
     with conn.cursor(dictionary=True) as cur:
-        cur.execute(sql, (target_date,))
+        cur.execute(sql, (first_date, last_date))
         rows = cur.fetchall()
-    return [
-        (row["sector"], row["code"], int(row.get("weight_sum") or 0)) for row in rows
-        if row.get("weight_sum")
-    ]
+    weights: Dict[dt.date, List[Tuple[str, str, int]]] = {}
+    for row in rows:
+        if not row.get("weight_sum"):
+            continue
+        weights.setdefault(to_date(row["date"]), []).append(
+            (row["sector"], row["code"], int(row["weight_sum"]))
+        )
+    return weights
+
 
+def fetch_existing_apply_counts(
+    conn, first_date: dt.date, last_date: dt.date
+) -> Dict[Tuple[dt.date, str, int], Tuple[int, int]]:
+    """(work_date, sector, position)별 기존 work_apply (건수, 최대 seq)."""
 
-def fetch_available_workers(conn, target_date: dt.date) -> List[WorkerAvailability]:
-    weekday = (target_date.weekday() + 1) % 7  # Python Mon=0 → DB Sun=0
+    counts: Dict[Tuple[dt.date, str, int], Tuple[int, int]] = {}
     with conn.cursor(dictionary=True) as cur:
         cur.execute(
             """
-            SELECT w.id, w.tier,
-                   EXISTS(
-                       SELECT 1 FROM worker_schedule_exception e
-                       WHERE e.worker_id = w.id AND e.excpt_date = %s AND e.cancel_work_yn = 1
-                   ) AS has_cancel_exc,
-                   EXISTS(
-                       SELECT 1 FROM worker_schedule_exception e
-                       WHERE e.worker_id = w.id AND e.excpt_date = %s AND e.add_work_yn = 1
-                   ) AS has_add_exc,
-                   EXISTS(
-                       SELECT 1 FROM worker_weekly_pattern p
-                       WHERE p.worker_id = w.id AND p.weekday = %s
-                   ) AS has_weekly
-            FROM worker_header w
-            WHERE w.tier > 1
-        """,
-            (target_date, target_date, weekday),
+            SELECT work_date, basecode_sector, position,
+                   COUNT(*) AS cnt, COALESCE(MAX(seq), 0) AS max_seq
+            FROM work_apply
+            WHERE work_date BETWEEN %s AND %s
+            GROUP BY work_date, basecode_sector, position
+            """,
+            (first_date, last_date),
         )
-        rows = cur.fetchall()
-    avail: List[WorkerAvailability] = []
-    for row in rows:
-        if row["has_cancel_exc"]:
-            continue
-        if not (row["has_add_exc"] or row["has_weekly"]):
-            continue
-        avail.append(
+        for row in cur.fetchall():
+            key = (to_date(row["work_date"]), row["basecode_sector"], int(row["position"]))
+            counts[key] = (int(row["cnt"]), int(row["max_seq"]))
+    return counts
+
+
+def fetch_availability_calendar(
+    conn, target_dates: Sequence[dt.date]
+) -> AvailabilityCalendar:
+    """대상 일자 전체의 가용 달력을 worker/정규 패턴/예외 집합 쿼리 세 번으로 만든다."""
+
+    calendar = AvailabilityCalendar(available={})
+    if not target_dates:
+        return calendar
+    with conn.cursor() as cur:
+        cur.execute("SELECT id, tier FROM worker_header WHERE tier > 1")
+        tiers = {int(row[0]): int(row[1]) for row in cur.fetchall()}
+        cur.execute(
+            "SELECT DISTINCT weekday, worker_id FROM worker_weekly_pattern "
+            "WHERE worker_id IS NOT NULL"
+        )
+        weekly: Dict[int, Set[int]] = {}
+        for weekday, worker_id in cur.fetchall():
+            weekly.setdefault(int(weekday), set()).add(int(worker_id))
+        cur.execute(
+            """
+            SELECT worker_id, excpt_date,
+                   MAX(cancel_work_yn = 1) AS has_cancel, MAX(add_work_yn = 1) AS has_add
+            FROM worker_schedule_exception
+            WHERE excpt_date BETWEEN %s AND %s
+            GROUP BY worker_id, excpt_date
+            """,
+            (min(target_dates), max(target_dates)),
+        )
+        cancels: Set[Tuple[int, dt.date]] = set()
+        adds: Set[Tuple[int, dt.date]] = set()
+        for worker_id, excpt_date, has_cancel, has_add in cur.fetchall():
+            key = (int(worker_id), to_date(excpt_date))
+            if has_cancel:
+                cancels.add(key)
+            if has_add:
+                adds.add(key)
+
+    for day in sorted(set(target_dates)):
+        regular = weekly.get((day.weekday() + 1) % 7, set())  # Python Mon=0 → DB Sun=0
+        calendar.available[day] = [
             WorkerAvailability(
-                id=int(row["id"]),
-                tier=int(row["tier"]),
-                add_override=bool(row["has_add_exc"]),
-                is_regular=bool(row["has_weekly"]),
+                id=worker_id,
+                tier=tier,
+                add_override=(worker_id, day) in adds,
+                is_regular=worker_id in regular,
             )
-        )
-    return avail
+            for worker_id, tier in sorted(tiers.items())
+            if (worker_id, day) not in cancels
+            and ((worker_id, day) in adds or worker_id in regular)
+        ]
+    return calendar
 
 
 def _match_rule(weight: int, rules: List[ApplyRule]) -> Optional[ApplyRule]:
@@ -605,13 +1032,19 @@ def _match_rule(weight: int, rules: List[ApplyRule]) -> Optional[ApplyRule]:
     return None
 
 
-def _pick_workers(candidates: List[WorkerAvailability], count: int, used: set[int]) -> List[WorkerAvailability]:
+def _pick_workers(
+    candidates: List[WorkerAvailability],
+    count: int,
+    used: set[int],
+    load: Optional[Dict[int, int]] = None,
+) -> List[WorkerAvailability]:
     selected: List[WorkerAvailability] = []
     for worker in sorted(
         candidates,
         key=lambda w: (
             -int(w.is_regular),
             -int(w.add_override),
+            load.get(w.id, 0) if load else 0,
             -w.tier,
             w.id,
         ),
@@ -624,11 +1057,65 @@ def _pick_workers(candidates: List[WorkerAvailability], count: int, used: set[in
     return selected
 
 
+def solve_butler_assignments(
+    open_slots: Dict[dt.date, List[int]],
+    calendar: AvailabilityCalendar,
+    busy: Dict[dt.date, Set[int]],
+    load: Dict[int, int],
+) -> Tuple[List[Tuple[int, int]], int]:
+    """기간 전체의 빈 butler 슬롯에 worker를 한 번에 배정한다.
+
+    open_slots: 일자별 빈 슬롯 id(배정 순서대로), busy: 일자별 이미 배정된 worker,
+    load: 기간 내 worker별 기존 butler 배정 수(배정하면서 갱신된다).
+    한 worker는 하루 한 슬롯만 맡고, 기간 전체 배정 수는 공정 분배 상한
+    ceil(전체 슬롯 / 가용 worker 수)을 우선 지킨다. 상한 안에서 채우지 못한 슬롯만
+    상한을 넘겨 채운다. 후보 대비 빈 슬롯이 많은 일자부터 채워 여유 있는 일자가
+    인력을 먼저 소진하지 않게 한다. (worker_id, slot_id) 목록과 적용한 상한을 반환한다.
+    """
+
+    pool = {w.id for day in open_slots for w in calendar.available.get(day, [])}
+    if not pool:
+        return [], 0
+    total = sum(len(ids) for ids in open_slots.values()) + sum(load.get(w, 0) for w in pool)
+    cap = max(1, math.ceil(total / len(pool)))
+
+    assignments: List[Tuple[int, int]] = []
+    for day in sorted(
+        open_slots,
+        key=lambda d: (len(calendar.available.get(d, [])) - len(open_slots[d]), d),
+    ):
+        slot_ids = open_slots[day]
+        used = busy.setdefault(day, set())
+        candidates = calendar.available.get(day, [])
+        picked = _pick_workers(
+            [w for w in candidates if load.get(w.id, 0) < cap], len(slot_ids), used, load
+        )
+        if len(picked) < len(slot_ids):
+            taken = used | {w.id for w in picked}
+            picked += _pick_workers(candidates, len(slot_ids) - len(picked), taken, load)
+        for slot_id, worker in zip(slot_ids, picked):
+            assignments.append((worker.id, slot_id))
+            used.add(worker.id)
+            load[worker.id] = load.get(worker.id, 0) + 1
+    return assignments, cap
+
+
 # ------------------------------ ICS 처리 ------------------------------
+def ics_platform(url: str) -> str:
+    lowered = url.lower()
+    return "airbnb" if "airbnb" in lowered else "booking" if "booking" in lowered else "ics"
+
+
+def ics_host(url: str) -> str:
+    """동시성 제한 키로 사용할 호스트명(소문자)을 반환한다."""
+
+    return (urlparse(url).hostname or "").lower()
+
+
 def build_ics_filename(
     room: Room, url: str, existing: set[str], idx: int
 ) -> str:
-    platform = "airbnb" if "airbnb" in url.lower() else "booking" if "booking" in url.lower() else "ics"
+    platform = ics_platform(url)
     raw_short = room.building_short_name or room.building_name or f"b{room.building_id}"
     # 한글 등 비ASCII 문자는 허용하고, 파일 시스템에 문제가 될 수 있는 최소한의 문자만 제거한다.
     safe_short = re.sub(r"[^\w-]", "", raw_short, flags=re.UNICODE)
@@ -644,83 +1131,1908 @@ def build_ics_filename(
     return name
 
 
-def download_ics(url: str, dest_dir: Path, filename: str) -> Optional[Path]:
-    try:
-        response = requests.get(url, timeout=20)
-        response.raise_for_status()
-    except requests.RequestException as exc:
-        logging.warning("ICS 다운로드 실패(%s): %s", url, exc)
-        return None
-    target = dest_dir / f"{filename}.ics"
-    target.write_bytes(response.content)
-    return target
+class IcsHttpCache:
+    """URL별 HTTP 검증자(ETag/Last-Modified)와 마지막 본문의 blob 해시를 보관한다.
 
+    다음 실행에서 ``If-None-Match``/``If-Modified-Since``를 보내고, 304 응답이면
+    보관소(:class:`IcsArchive`)의 blob을 그대로 재사용한다. 파일은 URL 해시(sha1)로 구분한다.
+    """
 
-def parse_events(path: Path) -> List[Event]:
-    """Parse ICS and return merged VEVENT ranges (start/end only)."""
+    def __init__(self, base_dir: Path, archive: "IcsArchive") -> None:
+        self.base_dir = base_dir
+        self.archive = archive
+        self.not_modified = 0
+        self._lock = threading.Lock()
 
-    events: List[Event] = []
-    try:
-        calendar = Calendar.from_ical(path.read_bytes())
-    except ValueError as exc:
-        logging.warning("ICS 파싱 실패(%s): %s", path, exc)
-        return events
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
 
-    for component in calendar.walk("VEVENT"):
+    def _meta_path(self, url: str) -> Path:
+        return self.base_dir / f"{self._key(url)}.json"
+
+    def _load_meta(self, url: str) -> Optional[Dict[str, str]]:
         try:
-            start = to_aware(component.decoded("dtstart"))
-            end = to_aware(component.decoded("dtend"))
-        except Exception as exc:  # pylint: disable=broad-except
-            logging.warning("VEVENT 파싱 실패(%s): %s", path, exc)
-            continue
-        events.append(Event(start=start, end=end))
+            meta = json.loads(self._meta_path(url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        # 본문 blob이 사라진 항목은 검증자를 보내지 않는다(조건 없이 다시 받음).
+        if not meta.get("sha256") or not self.archive.blob_path(meta["sha256"]).exists():
+            return None
+        return meta
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        meta = self._load_meta(url)
+        if meta is None:
+            return {}
+        headers: Dict[str, str] = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def cached_blob(self, url: str) -> Optional[Path]:
+        meta = self._load_meta(url)
+        if meta is None:
+            return None
+        path = self.archive.touch(meta["sha256"])
+        if path is None:
+            return None
+        try:
+            os.utime(self._meta_path(url))
+        except OSError:
+            pass
+        with self._lock:
+            self.not_modified += 1
+        return path
+
+    def store(self, url: str, response: requests.Response, digest: str) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not (etag or last_modified):
+            # 검증자 없는 새 본문: 이전 검증자를 남기면 다음 실행이 304로 옛 blob을 재사용한다.
+            try:
+                self._meta_path(url).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as exc:
+                logging.warning("ICS 캐시 삭제 실패(%s): %s", url, exc)
+            return
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "sha256": digest,
+            "fetched_at": dt.datetime.now(SEOUL).isoformat(),
+        }
+        try:
+            self.base_dir.mkdir(parents=True, exist_ok=True)
+            _write_atomic(
+                self._meta_path(url),
+                json.dumps(meta, ensure_ascii=False).encode("utf-8"),
+            )
+        except OSError as exc:
+            logging.warning("ICS 캐시 저장 실패(%s): %s", url, exc)
 
-    return events
+    def referenced_digests(self) -> List[str]:
+        """보관 중인 검증자가 가리키는 blob 해시 목록(보관소 GC 참조 계산용)."""
 
+        if not self.base_dir.exists():
+            return []
+        digests: List[str] = []
+        for path in self.base_dir.glob("*.json"):
+            try:
+                digest = json.loads(path.read_text(encoding="utf-8")).get("sha256")
+            except (OSError, ValueError):
+                continue
+            if digest:
+                digests.append(digest)
+        return digests
 
-def extract_out_time(events: Sequence[Event], target_date: dt.date) -> Optional[dt.time]:
-    for event in events:
-        if event.end.date() == target_date:
-            return event.end.time()
-    return None
+    def prune(self, keep_days: int) -> None:
+        """keep_days 동안 재사용/갱신되지 않은 캐시 항목을 정리한다."""
 
+        if not self.base_dir.exists():
+            return
+        cutoff = (dt.datetime.now() - dt.timedelta(days=keep_days)).timestamp()
+        for path in self.base_dir.iterdir():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                continue
 
-def has_checkin_on(events: Sequence[Event], target_date: dt.date) -> bool:
-    for event in events:
-        if event.start.date() == target_date:
-            return True
-    return False
 
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
 
-# ------------------------------ 모델 계산 ------------------------------
-def interpolate(value_d1: float, value_d7: float, horizon: int) -> float:
-    ratio = (horizon - 1) / 6
-    return (1 - ratio) * value_d1 + ratio * value_d7
 
+class IcsArchive:
+    """내용 주소(sha256) 기반 ICS 보관소.
 
-def params_for_horizon(model: Dict[str, float], horizon: int) -> Tuple[float, float, float]:
-    if horizon <= 1:
-        return model["d1_alpha"], model["d1_beta"], model["d1_high"]
-    if horizon >= 7:
-        return model["d7_alpha"], model["d7_beta"], model["d7_high"]
-    alpha = interpolate(model["d1_alpha"], model["d7_alpha"], horizon)
-    beta = interpolate(model["d1_beta"], model["d7_beta"], horizon)
-    high = interpolate(model["d1_high"], model["d7_high"], horizon)
-    return alpha, beta, high
+    본문은 ``blobs/<앞 2자리>/<sha256>.ics.gz``에 gzip으로 한 번만 저장하고, 실행마다
+    ``manifests/<YYYYMMDDhhmmss>.json``에 (room_id, url, filename, sha256) 목록만 남긴다.
+    보관 기간은 manifest 단위로 keep-days를 적용하고, blob은 남은 manifest와 HTTP 캐시가
+    하나도 참조하지 않을 때 삭제한다(참조 카운트).
+    """
 
+    BLOB_SUFFIX = ".ics.gz"
 
-def compute_p_out(model: Dict[str, float], horizon: int, weekday: int) -> Tuple[float, float]:
-    alpha, beta, high = params_for_horizon(model, horizon)
-    base = WEEKDAY_BASE.get(weekday, 0.5)
-    p_out = sigmoid(alpha + beta * base)
-    if horizon == 1:
-        p_out *= 0.6
-    elif horizon >= 7:
-        p_out *= 1.1
-    p_out *= WEEKDAY_FACTOR.get(weekday, 1.0)
+    def __init__(self, base_dir: Path) -> None:
+        self.blob_dir = base_dir / "blobs"
+        self.manifest_dir = base_dir / "manifests"
+        self.stored = 0
+        self.deduplicated = 0
+        self._lock = threading.Lock()
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / f"{digest}{self.BLOB_SUFFIX}"
+
+    @classmethod
+    def digest_of(cls, path: Path) -> Optional[str]:
+        """보관소 blob 경로이면 sha256을, 아니면 None을 돌려준다."""
+
+        name = path.name
+        if not name.endswith(cls.BLOB_SUFFIX):
+            return None
+        digest = name[: -len(cls.BLOB_SUFFIX)]
+        return digest if len(digest) == 64 else None
+
+    def touch(self, digest: str) -> Optional[Path]:
+        path = self.blob_path(digest)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def put(self, data: bytes) -> Path:
+        digest = hashlib.sha256(data).hexdigest()
+        # 이미 있는 blob은 mtime만 갱신해 진행 중인 실행의 blob이 GC되지 않게 한다.
+        path = self.touch(digest)
+        if path is not None:
+            with self._lock:
+                self.deduplicated += 1
+            return path
+        path = self.blob_path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(path, gzip.compress(data, mtime=0))
+        with self._lock:
+            self.stored += 1
+        return path
+
+    def write_manifest(
+        self,
+        run_date: dt.date,
+        tasks: Sequence[IcsTask],
+        blobs: Sequence[Optional[Path]],
+    ) -> Path:
+        """task 순서대로 manifest를 기록한다. 다운로드 실패 항목은 sha256=null."""
+
+        now = dt.datetime.now(SEOUL)
+        payload = {
+            "created_at": now.isoformat(),
+            "run_date": run_date.isoformat(),
+            "entries": [
+                {
+                    "room_id": task.room_id,
+                    "url": task.url,
+                    "filename": task.filename,
+                    "sha256": self.digest_of(blob) if blob else None,
+                }
+                for task, blob in zip(tasks, blobs)
+            ],
+        }
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+        stamp = now.strftime("%Y%m%d%H%M%S")
+        path = self.manifest_dir / f"{stamp}.json"
+        suffix = 2
+        while path.exists():
+            path = self.manifest_dir / f"{stamp}_{suffix}.json"
+            suffix += 1
+        _write_atomic(path, json.dumps(payload, ensure_ascii=False, indent=1).encode("utf-8"))
+        return path
+
+    @staticmethod
+    def _manifest_digests(path: Path) -> List[str]:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        return [entry["sha256"] for entry in payload.get("entries", []) if entry.get("sha256")]
+
+    def gc(self, keep_days: int, extra_refs: Sequence[str] = ()) -> None:
+        """keep-days가 지난 manifest를 지우고, 참조가 0이 된 blob을 정리한다."""
+
+        cutoff = (dt.datetime.now() - dt.timedelta(days=keep_days)).timestamp()
+        refs: Dict[str, int] = {}
+        expired = 0
+        if self.manifest_dir.exists():
+            for path in sorted(self.manifest_dir.glob("*.json")):
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        path.unlink()
+                        expired += 1
+                        continue
+                    digests = self._manifest_digests(path)
+                except (OSError, ValueError, KeyError) as exc:
+                    logging.warning("ICS manifest 읽기 실패(%s): %s", path, exc)
+                    continue
+                for digest in digests:
+                    refs[digest] = refs.get(digest, 0) + 1
+        for digest in extra_refs:
+            refs[digest] = refs.get(digest, 0) + 1
+
+        freed = 0
+        if self.blob_dir.exists():
+            for path in self.blob_dir.glob(f"*/*{self.BLOB_SUFFIX}"):
+                if refs.get(self.digest_of(path) or ""):
+                    continue
+                try:
+                    # 참조가 없어도 keep-days 이내 blob은 아직 manifest를 쓰지 않은
+                    # 동시 실행(예: 관리자 refresh)의 것일 수 있으므로 남긴다.
+                    if path.stat().st_mtime >= cutoff:
+                        continue
+                    path.unlink()
+                    freed += 1
+                except OSError:
+                    continue
+        if expired or freed:
+            logging.info(
+                "ICS 보관소 정리: manifest %s건, 미참조 blob %s건 삭제 (참조 중 blob %s건)",
+                expired,
+                freed,
+                len(refs),
+            )
+
+
+def read_ics_file(path: Path) -> bytes:
+    """ICS 파일을 읽는다. 보관소 blob(.ics.gz)은 압축을 풀어 돌려준다."""
+
+    data = path.read_bytes()
+    if path.name.endswith(".gz"):
+        return gzip.decompress(data)
+    return data
+
+
+def download_ics(
+    url: str,
+    archive: IcsArchive,
+    cache: Optional[IcsHttpCache] = None,
+    read_timeout: float = ICS_READ_TIMEOUT,
+) -> Optional[Path]:
+    """URL을 받아 보관소에 저장하고 blob 경로를 돌려준다(실패 시 None)."""
+
+    headers = cache.conditional_headers(url) if cache else {}
+    try:
+        session = get_session()
+        response = session.get(url, timeout=http_timeout(read_timeout), headers=headers)
+        if response.status_code == 304 and cache is not None:
+            cached = cache.cached_blob(url)
+            if cached is not None:
+                return cached
+            # 검증자만 남고 본문이 사라진 경우 조건 없이 다시 받는다.
+            response = session.get(url, timeout=http_timeout(read_timeout))
+        response.raise_for_status()
+        body = response.content
+    except requests.RequestException as exc:
+        logging.warning("ICS 다운로드 실패(%s): %s", url, exc)
+        return None
+    try:
+        target = archive.put(body)
+    except OSError as exc:
+        logging.warning("ICS 보관 실패(%s): %s", url, exc)
+        return None
+    if cache is not None:
+        cache.store(url, response, IcsArchive.digest_of(target) or "")
+    return target
+
+
+class UrlHealthRegistry:
+    """iCal URL별 상태(연속 실패, 응답 시간 표본, 마지막 성공)를 실행 간에 보관한다.
+
+    연속 실패가 ``CIRCUIT_FAILURE_THRESHOLD``회 이상이면 회로를 열어 짧은 타임아웃
+    (``CIRCUIT_PROBE_TIMEOUT``)으로 한 번만 확인하고, 정상 URL은 관측된 p95 응답 시간의
+    ``ADAPTIVE_TIMEOUT_FACTOR``배(``ADAPTIVE_TIMEOUT_MIN``~``ICS_READ_TIMEOUT`` 사이)를
+    read 타임아웃으로 쓴다.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: Dict[str, Dict[str, object]] = {}
+        self.probed = 0
+        self._touched: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        try:
+            self.entries = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as exc:
+            logging.warning("URL 상태 파일 읽기 실패(%s): %s", path, exc)
+
+    @staticmethod
+    def p95(samples: Sequence[float]) -> Optional[float]:
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[max(0, math.ceil(len(ordered) * 0.95) - 1)]
+
+    def is_open(self, url: str) -> bool:
+        entry = self.entries.get(url) or {}
+        return int(entry.get("fail_streak", 0)) >= CIRCUIT_FAILURE_THRESHOLD
+
+    def timeout_for(self, url: str) -> float:
+        if self.is_open(url):
+            with self._lock:
+                self.probed += 1
+            return CIRCUIT_PROBE_TIMEOUT
+        samples = (self.entries.get(url) or {}).get("latencies") or []
+        if len(samples) < LATENCY_MIN_SAMPLES:
+            return ICS_READ_TIMEOUT
+        return clamp(
+            self.p95(samples) * ADAPTIVE_TIMEOUT_FACTOR, ADAPTIVE_TIMEOUT_MIN, ICS_READ_TIMEOUT
+        )
+
+    def record(self, url: str, room_id: int, ok: bool, elapsed: float) -> None:
+        now = dt.datetime.now(SEOUL).isoformat(timespec="seconds")
+        with self._lock:
+            entry = self.entries.setdefault(url, {})
+            entry["room_id"] = room_id
+            entry["last_seen"] = now
+            if ok:
+                entry["fail_streak"] = 0
+                entry["last_success"] = now
+                samples = list(entry.get("latencies") or [])
+                samples.append(round(elapsed, 3))
+                entry["latencies"] = samples[-LATENCY_SAMPLE_SIZE:]
+            else:
+                entry["fail_streak"] = int(entry.get("fail_streak", 0)) + 1
+                entry["last_failure"] = now
+            self._touched[url] = room_id
+
+    def degraded(self) -> List[Tuple[str, Dict[str, object]]]:
+        """이번 실행에서 실패했거나 회로가 열렸거나 느린(p95 ≥ SLOW_URL_P95) URL 목록."""
+
+        result = []
+        for url in self._touched:
+            entry = self.entries[url]
+            p95 = self.p95(entry.get("latencies") or [])
+            if int(entry.get("fail_streak", 0)) > 0 or (p95 is not None and p95 >= SLOW_URL_P95):
+                result.append((url, entry))
+        return result
+
+    def save(self) -> None:
+        cutoff = dt.datetime.now(SEOUL) - dt.timedelta(days=URL_HEALTH_RETENTION_DAYS)
+        kept = {}
+        for url, entry in self.entries.items():
+            try:
+                last_seen = dt.datetime.fromisoformat(str(entry.get("last_seen")))
+            except ValueError:
+                continue
+            if last_seen >= cutoff:
+                kept[url] = entry
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            _write_atomic(self.path, json.dumps(kept, ensure_ascii=False).encode("utf-8"))
+        except OSError as exc:
+            logging.warning("URL 상태 파일 저장 실패(%s): %s", self.path, exc)
+
+
+class IcsDownloader:
+    """iCal URL을 스레드 풀로 병렬 다운로드한다.
+
+    전체 동시성은 ``max_workers``로, 호스트별(airbnb/booking 등) 동시 요청 수는
+    ``per_host_limit``로 제한한다. 결과는 입력 task 순서를 그대로 유지한다.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        per_host_limit: int,
+        archive: IcsArchive,
+        cache: Optional[IcsHttpCache] = None,
+        health: Optional[UrlHealthRegistry] = None,
+    ) -> None:
+        self.max_workers = max(1, max_workers)
+        self.per_host_limit = max(1, per_host_limit)
+        self.archive = archive
+        self.cache = cache
+        self.health = health
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = ics_host(url)
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_slots[host] = slot
+            return slot
+
+    def _fetch_one(self, task: IcsTask) -> Optional[Path]:
+        with self._host_slot(task.url):
+            if self.health is None:
+                return download_ics(task.url, self.archive, self.cache)
+            timeout = self.health.timeout_for(task.url)
+            started = dt.datetime.now(dt.timezone.utc)
+            path = download_ics(task.url, self.archive, self.cache, timeout)
+            elapsed = (dt.datetime.now(dt.timezone.utc) - started).total_seconds()
+            self.health.record(task.url, task.room_id, path is not None, elapsed)
+            return path
+
+    @staticmethod
+    def _interleave_by_host(tasks: Sequence[IcsTask]) -> List[int]:
+        """호스트별로 번갈아 제출해 한 호스트 대기열이 스레드를 점유하지 않게 한다."""
+
+        by_host: Dict[str, List[int]] = {}
+        for idx, task in enumerate(tasks):
+            by_host.setdefault(ics_host(task.url), []).append(idx)
+        queues = list(by_host.values())
+        order: List[int] = []
+        depth = 0
+        while len(order) < len(tasks):
+            for queue in queues:
+                if depth < len(queue):
+                    order.append(queue[depth])
+            depth += 1
+        return order
+
+    def iter_fetch(self, tasks: Sequence[IcsTask]) -> Iterator[Tuple[int, Optional[Path]]]:
+        """완료되는 순서대로 (task index, blob 경로 또는 None)을 돌려준다."""
+
+        if not tasks:
+            return
+        workers = min(self.max_workers, len(tasks))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ics") as pool:
+            futures = {
+                pool.submit(self._fetch_one, tasks[idx]): idx
+                for idx in self._interleave_by_host(tasks)
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def fetch_all(self, tasks: Sequence[IcsTask]) -> List[Optional[Path]]:
+        results: List[Optional[Path]] = [None] * len(tasks)
+        for idx, path in self.iter_fetch(tasks):
+            results[idx] = path
+        return results
+
+
+class IcsSnapshot:
+    """이전 실행에서 보관한 ICS를 네트워크 대신 읽는 재생(replay) 소스.
+
+    ``IcsDownloader``와 같은 ``iter_fetch`` 인터페이스를 제공한다. manifest는
+    (room_id, url)로, 보관소 도입 전 timestamp 폴더는 ``build_ics_filename``이 객실 id
+    순서로 다시 계산한 파일명으로 객실·URL에 매핑한다.
+    """
+
+    def __init__(self, source: Path) -> None:
+        self.source = source
+        self.run_date: Optional[dt.date] = None
+        self.missing = 0
+        self.manifest: Optional[Path] = None
+        self._blobs: Dict[Tuple[int, str], Optional[Path]] = {}
+        manifest = self._resolve_manifest(source)
+        if manifest is not None:
+            self._load_manifest(manifest)
+        elif not source.is_dir() or not any(source.glob("*.ics")):
+            raise SystemExit(
+                f"ICS 스냅샷을 찾을 수 없습니다: {source} (manifest 파일, manifests/가 있는 ics 폴더, "
+                ".ics가 든 timestamp 폴더 중 하나를 지정하세요)"
+            )
+
+    # IcsArchive.write_manifest가 만드는 이름(YYYYMMDDhhmmss[_n].json)
+    MANIFEST_NAME_RE = re.compile(r"^\d{14}(?:_\d+)?\.json$")
+
+    @classmethod
+    def _resolve_manifest(cls, source: Path) -> Optional[Path]:
+        if source.is_file():
+            return source
+        # ics/ 바로 아래의 url_health.json 등을 manifest로 오인하지 않도록
+        # manifests/ 폴더에서 manifest 이름 규칙에 맞는 파일만 찾는다.
+        manifest_dir = source / "manifests"
+        if manifest_dir.is_dir():
+            manifests = sorted(
+                path for path in manifest_dir.glob("*.json")
+                if cls.MANIFEST_NAME_RE.match(path.name)
+            )
+            if manifests:
+                return manifests[-1]
+        return None
+
+    def _load_manifest(self, manifest: Path) -> None:
+        try:
+            payload = json.loads(manifest.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise SystemExit(f"ICS manifest를 읽을 수 없습니다({manifest}): {exc}") from exc
+        entries = payload.get("entries") if isinstance(payload, dict) else None
+        if not isinstance(entries, list) or not all(
+            isinstance(entry, dict) and "room_id" in entry and "url" in entry
+            for entry in entries
+        ):
+            raise SystemExit(
+                f"ICS manifest 형식이 아닙니다({manifest}): room_id/url을 가진 entries 목록이 필요합니다"
+            )
+        archive = IcsArchive(manifest.parent.parent)
+        for entry in entries:
+            digest = entry.get("sha256")
+            key = (int(entry["room_id"]), entry["url"])
+            self._blobs[key] = archive.blob_path(digest) if digest else None
+        if payload.get("run_date"):
+            self.run_date = dt.date.fromisoformat(payload["run_date"])
+        self.manifest = manifest
+
+    def locate(self, task: IcsTask) -> Optional[Path]:
+        if self.manifest is not None:
+            key = (task.room_id, task.url)
+            if key not in self._blobs:
+                self.missing += 1
+                return None
+            path = self._blobs[key]
+        else:
+            path = self.source / f"{task.filename}.ics"
+        if path is None:
+            # 원래 실행에서도 다운로드에 실패한 항목
+            return None
+        if not path.exists():
+            self.missing += 1
+            return None
+        return path
+
+    def iter_fetch(self, tasks: Sequence[IcsTask]) -> Iterator[Tuple[int, Optional[Path]]]:
+        for idx, task in enumerate(tasks):
+            yield idx, self.locate(task)
+
+    def describe(self) -> str:
+        return str(self.manifest or self.source)
+
+
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc)
+_EVENT_CACHE_MAGIC = b"TCEV1"
+
+
+def encode_events(events: Sequence[Event]) -> bytes:
+    """Event 목록을 epoch 마이크로초(int64, little-endian) 쌍의 배열로 직렬화한다."""
+
+    values = array.array("q")
+    for event in events:
+        values.append((event.start - _EPOCH) // dt.timedelta(microseconds=1))
+        values.append((event.end - _EPOCH) // dt.timedelta(microseconds=1))
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
+
+
+def decode_events(blob: bytes) -> List[Event]:
+    values = array.array("q")
+    values.frombytes(blob)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return [
+        Event(
+            start=(_EPOCH + dt.timedelta(microseconds=values[i])).astimezone(SEOUL),
+            end=(_EPOCH + dt.timedelta(microseconds=values[i + 1])).astimezone(SEOUL),
+        )
+        for i in range(0, len(values), 2)
+    ]
+
+
+class ParsedEventCache:
+    """ICS 본문 해시(sha256)를 키로 정규화된 Event 목록을 디스크에 보관한다.
+
+    내용이 이전 실행과 동일한 캘린더는 icalendar 파싱과 ``to_aware`` 변환을
+    모두 건너뛴다.
+    """
+
+    def __init__(self, base_dir: Path) -> None:
+        self.base_dir = base_dir
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, digest: str) -> Path:
+        return self.base_dir / f"{digest}.ev"
+
+    def get(self, digest: str) -> Optional[List[Event]]:
+        path = self._path(digest)
+        try:
+            blob = path.read_bytes()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        if not blob.startswith(_EVENT_CACHE_MAGIC):
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return decode_events(blob[len(_EVENT_CACHE_MAGIC):])
+
+    def put(self, digest: str, events: Sequence[Event]) -> None:
+        try:
+            self.base_dir.mkdir(parents=True, exist_ok=True)
+            _write_atomic(self._path(digest), _EVENT_CACHE_MAGIC + encode_events(events))
+        except OSError as exc:
+            logging.warning("이벤트 캐시 저장 실패(%s): %s", digest, exc)
+
+    def prune(self, keep_days: int) -> None:
+        if not self.base_dir.exists():
+            return
+        cutoff = (dt.datetime.now() - dt.timedelta(days=keep_days)).timestamp()
+        for path in self.base_dir.iterdir():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                continue
+
+
+def parse_events(path: Path, cache: Optional[ParsedEventCache] = None) -> List[Event]:
+    """Parse ICS and return merged VEVENT ranges (start/end only)."""
+
+    digest = IcsArchive.digest_of(path)
+    if digest is None:
+        return parse_ics_bytes(path.read_bytes(), str(path), cache)
+    # 보관소 blob은 파일명이 곧 본문 해시이므로 캐시 hit이면 압축 해제도 건너뛴다.
+    if cache is not None:
+        cached = cache.get(digest)
+        if cached is not None:
+            return cached
+    events = _parse_ics_uncached(read_ics_file(path), str(path))
+    if cache is not None:
+        cache.put(digest, events)
+    return events
+
+
+def parse_ics_bytes(
+    data: bytes, source: str, cache: Optional[ParsedEventCache] = None
+) -> List[Event]:
+    digest = hashlib.sha256(data).hexdigest() if cache is not None else ""
+    if cache is not None:
+        cached = cache.get(digest)
+        if cached is not None:
+            return cached
+
+    events = _parse_ics_uncached(data, source)
+    if cache is not None:
+        cache.put(digest, events)
+    return events
+
+
+def _parse_ics_uncached(data: bytes, source: str) -> List[Event]:
+    try:
+        return parse_vevents_fast(data, source)
+    except IcsFastPathUnsupported as exc:
+        logging.debug("ICS fast path 미지원(%s): %s → icalendar 사용", source, exc)
+        return _parse_with_icalendar(data, source)
+
+
+class IcsFastPathUnsupported(ValueError):
+    """스트리밍 추출기가 처리하지 않는 입력(→ icalendar로 재파싱)."""
+
+
+_ICS_DATE_RE = re.compile(r"^(\d{4})(\d{2})(\d{2})$")
+_ICS_DATETIME_RE = re.compile(r"^(\d{4})(\d{2})(\d{2})T(\d{2})(\d{2})(\d{2})(Z?)$")
+_ZONE_CACHE: Dict[str, dt.tzinfo] = {}
+
+
+def _unfold_ics_lines(text: str):
+    """RFC 5545 line folding(CRLF + 공백/탭)을 풀어 논리 라인 단위로 돌려준다."""
+
+    current: Optional[str] = None
+    for raw in text.splitlines():
+        if raw[:1] in (" ", "\t"):
+            if current is None:
+                raise IcsFastPathUnsupported("첫 줄이 continuation line")
+            current += raw[1:]
+            continue
+        if current is not None:
+            yield current
+        current = raw
+    if current is not None:
+        yield current
+
+
+def _split_ics_property(line: str) -> Tuple[str, Dict[str, str], str]:
+    """``NAME;PARAM=V;...:VALUE`` 형식을 (이름, 파라미터, 값)으로 나눈다."""
+
+    in_quote = False
+    colon = -1
+    splits: List[int] = []
+    for idx, char in enumerate(line):
+        if char == '"':
+            in_quote = not in_quote
+        elif in_quote:
+            continue
+        elif char == ";":
+            splits.append(idx)
+        elif char == ":":
+            colon = idx
+            break
+    if colon <= 0:
+        raise IcsFastPathUnsupported(f"content line 형식 오류: {line[:40]!r}")
+    bounds = [-1, *splits, colon]
+    parts = [line[bounds[i] + 1:bounds[i + 1]] for i in range(len(bounds) - 1)]
+    params: Dict[str, str] = {}
+    for part in parts[1:]:
+        key, sep, param_value = part.partition("=")
+        if not sep:
+            raise IcsFastPathUnsupported(f"파라미터 형식 오류: {part!r}")
+        params[key.upper()] = param_value.strip('"')
+    return parts[0].upper(), params, line[colon + 1:]
+
+
+def _resolve_zone(tzid: str) -> dt.tzinfo:
+    zone = _ZONE_CACHE.get(tzid)
+    if zone is None:
+        try:
+            zone = ZoneInfo(tzid)
+        except (KeyError, ValueError) as exc:
+            raise IcsFastPathUnsupported(f"알 수 없는 TZID: {tzid!r}") from exc
+        _ZONE_CACHE[tzid] = zone
+    return zone
+
+
+def _decode_ics_datetime(params: Dict[str, str], value: str):
+    """DTSTART/DTEND 값을 icalendar ``decoded()``와 동일한 date/datetime으로 변환한다."""
+
+    value_type = params.get("VALUE", "").upper()
+    try:
+        match = _ICS_DATE_RE.match(value)
+        if match:
+            if value_type not in ("", "DATE"):
+                raise IcsFastPathUnsupported(f"VALUE={value_type} / date 값 불일치")
+            return dt.date(*(int(g) for g in match.groups()))
+        match = _ICS_DATETIME_RE.match(value)
+        if not match or value_type not in ("", "DATE-TIME"):
+            raise IcsFastPathUnsupported(f"지원하지 않는 날짜 형식: {value!r}")
+        fields = [int(g) for g in match.groups()[:6]]
+        is_utc = bool(match.group(7))
+        tzid = params.get("TZID")
+        if is_utc and tzid:
+            raise IcsFastPathUnsupported("TZID와 UTC(Z)가 함께 지정됨")
+        if is_utc:
+            return dt.datetime(*fields, tzinfo=dt.timezone.utc)
+        if tzid:
+            return dt.datetime(*fields, tzinfo=_resolve_zone(tzid))
+        return dt.datetime(*fields)
+    except (TypeError, ValueError) as exc:
+        if isinstance(exc, IcsFastPathUnsupported):
+            raise
+        raise IcsFastPathUnsupported(f"날짜 값 오류: {value!r}") from exc
+
+
+def parse_vevents_fast(data: bytes, source: str) -> List[Event]:
+    """캘린더 트리를 만들지 않고 VEVENT의 DTSTART/DTEND만 순차 추출한다.
+
+    line unfolding, VALUE=DATE, TZID, UTC(Z), floating 시각을 처리한다.
+    VTIMEZONE 정의, 중복 속성, 비정형 라인 등 확신할 수 없는 입력은
+    ``IcsFastPathUnsupported``를 던져 icalendar 경로로 넘긴다.
+    """
+
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        raise IcsFastPathUnsupported("UTF-8 디코딩 실패") from exc
+
+    events: List[Event] = []
+    stack: List[str] = []
+    calendars = 0
+    props: Dict[str, Tuple[Dict[str, str], str]] = {}
+    for line in _unfold_ics_lines(text):
+        if not line.strip():
+            continue
+        name, params, value = _split_ics_property(line)
+        if name == "BEGIN":
+            component = value.strip().upper()
+            if not stack:
+                if component != "VCALENDAR" or calendars:
+                    raise IcsFastPathUnsupported("VCALENDAR가 1개가 아님")
+                calendars += 1
+            elif component == "VTIMEZONE":
+                raise IcsFastPathUnsupported("VTIMEZONE 정의 포함")
+            stack.append(component)
+            if component == "VEVENT":
+                props = {}
+            continue
+        if name == "END":
+            component = value.strip().upper()
+            if not stack or stack[-1] != component:
+                raise IcsFastPathUnsupported(f"BEGIN/END 불일치: {component}")
+            stack.pop()
+            if component == "VEVENT":
+                try:
+                    start = to_aware(_decode_ics_datetime(*props["DTSTART"]))
+                    end = to_aware(_decode_ics_datetime(*props["DTEND"]))
+                except KeyError as exc:
+                    logging.warning("VEVENT 파싱 실패(%s): %s", source, exc)
+                    continue
+                events.append(Event(start=start, end=end))
+            continue
+        if not stack:
+            raise IcsFastPathUnsupported("컴포넌트 밖의 속성")
+        if stack[-1] == "VEVENT" and name in ("DTSTART", "DTEND"):
+            if name in props:
+                raise IcsFastPathUnsupported(f"중복 {name}")
+            props[name] = (params, value)
+
+    if stack or not calendars:
+        raise IcsFastPathUnsupported("VCALENDAR가 닫히지 않음")
+    return events
+
+
+def verify_fast_parser(paths: Sequence[Path]) -> List[str]:
+    """fast path와 icalendar 결과를 비교해 불일치 파일 목록을 돌려준다."""
+
+    mismatches: List[str] = []
+    fast_count = 0
+    for path in paths:
+        data = read_ics_file(path)
+        expected = _parse_with_icalendar(data, str(path))
+        try:
+            actual = parse_vevents_fast(data, str(path))
+        except IcsFastPathUnsupported as exc:
+            logging.info("fast path 미지원(%s): %s", path, exc)
+            continue
+        fast_count += 1
+        if actual != expected:
+            mismatches.append(str(path))
+            logging.warning(
+                "ICS 파서 불일치(%s): fast=%s건, icalendar=%s건",
+                path,
+                len(actual),
+                len(expected),
+            )
+    logging.info(
+        "ICS 파서 검증: 대상 %s건, fast path 처리 %s건, 불일치 %s건",
+        len(paths),
+        fast_count,
+        len(mismatches),
+    )
+    return mismatches
+
+
+def _parse_with_icalendar(data: bytes, source: str) -> List[Event]:
+    events: List[Event] = []
+    try:
+        calendar = Calendar.from_ical(data)
+    except ValueError as exc:
+        logging.warning("ICS 파싱 실패(%s): %s", source, exc)
+        return events
+
+    for component in calendar.walk("VEVENT"):
+        try:
+            start = to_aware(component.decoded("dtstart"))
+            end = to_aware(component.decoded("dtend"))
+        except Exception as exc:  # pylint: disable=broad-except
+            logging.warning("VEVENT 파싱 실패(%s): %s", source, exc)
+            continue
+        events.append(Event(start=start, end=end))
+
+    return events
+
+
+def merge_events(events: Sequence[Event]) -> List[Event]:
+    """시작 시각 기준으로 정렬 후 겹치는 구간만 병합한다(back-to-back은 병합하지 않음)."""
+
+    merged: List[Event] = []
+    for event in sorted(events, key=lambda e: e.start):
+        if not merged:
+            merged.append(event)
+            continue
+        last = merged[-1]
+        if event.start < last.end:  # overlap → 병합 (back-to-back은 병합하지 않음)
+            merged[-1] = Event(start=last.start, end=max(last.end, event.end))
+        else:
+            merged.append(event)
+    return merged
+
+
+def collect_room_events(
+    paths: Sequence[Path], cache: Optional[ParsedEventCache] = None
+) -> List[Event]:
+    """객실 1개의 ICS 파일들(URL 순서)을 파싱해 하나의 타임라인으로 병합한다."""
+
+    all_events: List[Event] = []
+    for path in paths:
+        raw_events = parse_events(path, cache)
+        raw_events.sort(key=lambda e: e.start)
+        all_events.extend(raw_events)
+    return merge_events(all_events)
+
+
+def parse_room_events(
+    paths: Sequence[str], cache_dir: Optional[str]
+) -> Tuple[bytes, int, int]:
+    """프로세스 풀 작업 단위: 병합 타임라인을 직렬화해 (blob, 캐시 hit, miss)로 돌려준다."""
+
+    cache = ParsedEventCache(Path(cache_dir)) if cache_dir else None
+    merged = collect_room_events([Path(p) for p in paths], cache)
+    return encode_events(merged), (cache.hits if cache else 0), (cache.misses if cache else 0)
+
+
+def extract_out_time(events: Sequence[Event], target_date: dt.date) -> Optional[dt.time]:
+    for event in events:
+        if event.end.date() == target_date:
+            return event.end.time()
+    return None
+
+
+def has_checkin_on(events: Sequence[Event], target_date: dt.date) -> bool:
+    for event in events:
+        if event.start.date() == target_date:
+            return True
+    return False
+
+
+@dataclass
+class RoomTimeline:
+    """객실 병합 이벤트를 [first, last] 날짜 구간에 대해 한 번만 색인한 구조.
+
+    ``out_time``/``has_checkin``은 각각 ``extract_out_time``(해당 날짜에 끝나는 첫 이벤트)과
+    ``has_checkin_on``과 같은 결과를 상수 시간에 돌려준다.
+    """
+
+    first: dt.date
+    last: dt.date
+    out_times: Dict[dt.date, dt.time]
+    checkin_dates: Set[dt.date]
+
+    @classmethod
+    def build(cls, events: Sequence[Event], first: dt.date, last: dt.date) -> "RoomTimeline":
+        out_times: Dict[dt.date, dt.time] = {}
+        checkin_dates: Set[dt.date] = set()
+        for event in events:
+            end_date = event.end.date()
+            if first <= end_date <= last and end_date not in out_times:
+                out_times[end_date] = event.end.time()
+            start_date = event.start.date()
+            if first <= start_date <= last:
+                checkin_dates.add(start_date)
+        return cls(first=first, last=last, out_times=out_times, checkin_dates=checkin_dates)
+
+    def out_time(self, target_date: dt.date) -> Optional[dt.time]:
+        return self.out_times.get(target_date)
+
+    def has_checkin(self, target_date: dt.date) -> bool:
+        return target_date in self.checkin_dates
+
+
+def append_room_predictions(
+    batch: "PredictionBatch",
+    room: Room,
+    timeline: RoomTimeline,
+    run_date: dt.date,
+    offsets: Sequence[int],
+    p_out_table: "POutTable",
+) -> None:
+    """한 객실·기준일의 offset별 예측을 batch에 추가한다."""
+
+    for offset in offsets:
+        target_date = run_date + dt.timedelta(days=offset)
+        p_out, _, label = p_out_table.lookup(offset, target_date.weekday())
+        batch.append(
+            room,
+            target_date,
+            offset,
+            timeline.out_time(target_date),
+            p_out,
+            label,
+            timeline.has_checkin(target_date),
+            target_date == run_date,
+        )
+
+
+def room_fingerprint(
+    room: Room,
+    events: Sequence[Event],
+    run_date: dt.date,
+    offsets: Sequence[int],
+    model: Dict[str, float],
+) -> str:
+    """예측 결과를 결정하는 입력(기준일·offset·모델·객실 속성·예측 구간 이벤트)의 해시.
+
+    work_fore 행이 기준일(run_dttm)별이라 기준일이 바뀌면 모든 객실의 지문이 바뀐다. 따라서
+    건너뛰기는 같은 기준일·offset으로 다시 실행할 때(재실행, 같은 날 반복 실행)만 동작한다.
+    """
+
+    first = run_date + dt.timedelta(days=min(offsets))
+    last = run_date + dt.timedelta(days=max(offsets))
+    digest = hashlib.sha1()
+    header = [
+        run_date.isoformat(),
+        list(offsets),
+        sorted(model.items()),
+        room.sector,
+        room.sector_value,
+        str(room.checkin_time),
+        str(room.checkout_time),
+        room.bed_count,
+        room.weight,
+    ]
+    digest.update(json.dumps(header, default=str).encode("utf-8"))
+    for event in events:
+        # extract_out_time/has_checkin_on은 구간 안에서 시작하거나 끝나는 이벤트만 본다.
+        if first <= event.start.date() <= last or first <= event.end.date() <= last:
+            digest.update(f"{event.start.isoformat()}|{event.end.isoformat()};".encode("utf-8"))
+    return digest.hexdigest()
+
+
+# ------------------------------ 모델 계산 ------------------------------
+def interpolate(value_d1: float, value_d7: float, horizon: int) -> float:
+    ratio = (horizon - 1) / 6
+    return (1 - ratio) * value_d1 + ratio * value_d7
+
+
+def params_for_horizon(model: Dict[str, float], horizon: int) -> Tuple[float, float, float]:
+    if horizon <= 1:
+        return model["d1_alpha"], model["d1_beta"], model["d1_high"]
+    if horizon >= 7:
+        return model["d7_alpha"], model["d7_beta"], model["d7_high"]
+    alpha = interpolate(model["d1_alpha"], model["d7_alpha"], horizon)
+    beta = interpolate(model["d1_beta"], model["d7_beta"], horizon)
+    high = interpolate(model["d1_high"], model["d7_high"], horizon)
+    return alpha, beta, high
+
+
+def compute_p_out(model: Dict[str, float], horizon: int, weekday: int) -> Tuple[float, float]:
+    alpha, beta, high = params_for_horizon(model, horizon)
+    base = WEEKDAY_BASE.get(weekday, 0.5)
+    p_out = sigmoid(alpha + beta * base)
+    if horizon == 1:
+        p_out *= 0.6
+    elif horizon >= 7:
+        p_out *= 1.1
+    p_out *= WEEKDAY_FACTOR.get(weekday, 1.0)
     return clamp(p_out), high
 
 
+def p_out_label(p_out: float, high: float, borderline: float) -> str:
+    if p_out >= high:
+        return "○"
+    if p_out >= borderline:
+        return "△"
+    return ""
+
+
+class POutTable:
+    """(horizon, weekday)별 (p_out, high, label)을 미리 계산해 둔 표.
+
+    ``compute_p_out``은 객실과 무관하게 horizon·요일·모델만으로 결정되므로, 실행마다
+    offset × 7요일만 계산하고 객실별 예측은 표 조회로 대신한다. 값은 같은 함수로 만든
+    것이라 스칼라 경로와 비트 단위로 같다.
+    """
+
+    def __init__(self, model: Dict[str, float], horizons: Sequence[int]) -> None:
+        borderline = model["borderline"]
+        self._entries: Dict[Tuple[int, int], Tuple[float, float, str]] = {}
+        for horizon in set(horizons):
+            for weekday in range(7):
+                p_out, high = compute_p_out(model, horizon, weekday)
+                self._entries[(horizon, weekday)] = (
+                    p_out,
+                    high,
+                    p_out_label(p_out, high, borderline),
+                )
+
+    def lookup(self, horizon: int, weekday: int) -> Tuple[float, float, str]:
+        return self._entries[(horizon, weekday)]
+
+
+def benchmark_p_out(
+    model: Dict[str, float], horizons: Sequence[int], room_count: int
+) -> Tuple[bool, float, float]:
+    """스칼라 경로와 POutTable을 room_count × horizons 규모로 비교한다.
+
+    (결과 일치 여부, 스칼라 소요 초, 표 소요 초)를 돌려준다.
+    """
+
+    base = dt.date(2026, 1, 5)
+    borderline = model["borderline"]
+    started = dt.datetime.now(dt.timezone.utc)
+    scalar: List[Tuple[float, float, str]] = []
+    for _ in range(room_count):
+        for horizon in horizons:
+            weekday = (base + dt.timedelta(days=horizon)).weekday()
+            p_out, high = compute_p_out(model, horizon, weekday)
+            scalar.append((p_out, high, p_out_label(p_out, high, borderline)))
+    scalar_elapsed = (dt.datetime.now(dt.timezone.utc) - started).total_seconds()
+
+    started = dt.datetime.now(dt.timezone.utc)
+    table = POutTable(model, horizons)
+    tabled: List[Tuple[float, float, str]] = []
+    for _ in range(room_count):
+        for horizon in horizons:
+            tabled.append(table.lookup(horizon, (base + dt.timedelta(days=horizon)).weekday()))
+    table_elapsed = (dt.datetime.now(dt.timezone.utc) - started).total_seconds()
+
+    identical = len(scalar) == len(tabled) and all(
+        a[0].hex() == b[0].hex() and a[1].hex() == b[1].hex() and a[2] == b[2]
+        for a, b in zip(scalar, tabled)
+    )
+    return identical, scalar_elapsed, table_elapsed
+
+
+# ------------------------------ 예측 결과 sink ------------------------------
+class PredictionSink(ABC):
+    """객실 묶음 단위(PredictionBatch)로 예측 결과를 받아 처리하는 소비자.
+
+    ``write``는 ``SINK_BATCH_ROOMS``개 객실 이하의 묶음마다 호출되어 세션 임시 테이블이나 메모리에
+    쌓고, ``close``는 스트림이 끝난 뒤 공유 테이블 반영과 남은 정리(제거 객실, 지연 취소, 요약
+    로그)를 수행한다. 다운로드가 도는 동안 공유 테이블에 잠금을 잡지 않기 위해서다.
+    증분 모드에서는 스트림에 없는 객실 중 ``removed``에 속한 객실만 정리 대상이다.
+    sink는 커밋하지 않는다. 같은 커넥션의 다른 sink 변경까지 반영되기 때문이며, 커밋은
+    모든 sink를 닫은 뒤 BatchRunner가 실행당 한 번 한다(``--commit-per-date``만 예외).
+    """
+
+    @abstractmethod
+    def write(self, batch: PredictionBatch) -> None:
+        """묶음 하나를 받아 누적한다."""
+
+    def close(self, removed: Set[int]) -> None:
+        """removed: 이전 실행 대비 사라진 객실(증분 모드에서만 의미 있음)."""
+
+
+class WorkForeSink(PredictionSink):
+    """work_fore_d1/d7 writer(세션 임시 스테이징 테이블 경유).
+
+    예측 행은 ``FORE_WRITE_ROWS``건 단위로 임시 테이블(tmp_work_fore_d1/d7)에 쌓고, ``close``에서
+    자연키 (run_dttm, target_date, room_id)로 대상 테이블과 비교해 값이 바뀐 행만 UPDATE,
+    없는 행만 INSERT, 더 이상 없는 행만 DELETE 한다. 기준일 전체를 지우고 다시 넣을 때처럼
+    인덱스·binlog가 객실 수에 비례해 흔들리지 않고 실제 변경분만 쓰인다.
+    정리(DELETE) 범위는 전체 모드면 기준일(``run_dates``) 전체, 증분 모드면 흘려보낸 객실과
+    제거 객실이다. ``run_dates``를 주면(기간 재계산) 여러 기준일을 한 번에 반영한다.
+    """
+
+    TABLES = (("work_fore_d1", "tmp_work_fore_d1"), ("work_fore_d7", "tmp_work_fore_d7"))
+
+    def __init__(
+        self,
+        conn,
+        run_date: dt.date,
+        incremental: bool,
+        run_dates: Optional[Sequence[dt.date]] = None,
+    ) -> None:
+        self.conn = conn
+        self.run_date = run_date
+        self.run_dates = sorted(run_dates) if run_dates else [run_date]
+        self.incremental = incremental
+        self.staged = 0
+        self.rooms: Set[int] = set()
+        self._d1_rows: List[Tuple[dt.date, dt.date, int, float, int, int]] = []
+        self._d7_rows: List[Tuple[dt.date, dt.date, int, float, int, int]] = []
+        with conn.cursor() as cur:
+            for _, stage in self.TABLES:
+                cur.execute(FORE_STAGE_TABLE_SQL.format(table=stage))
+                cur.execute(f"DELETE FROM {stage}")
+            cur.execute(FORE_SCOPE_TABLE_SQL)
+            cur.execute("DELETE FROM tmp_work_fore_scope")
+
+    def write(self, batch: PredictionBatch, run_date: Optional[dt.date] = None) -> None:
+        run_dttm = run_date or self.run_date
+        self.rooms.update(batch.room_ids())
+        for horizon, target_date, room_id, p_out, actual_out, correct in batch.fore_rows():
+            payload = (run_dttm, target_date, room_id, round(p_out, 3), actual_out, correct)
+            # 1일/7일 외 구간은 가장 가까운 테이블에 저장한다.
+            if horizon <= 3:
+                self._d1_rows.append(payload)
+            else:
+                self._d7_rows.append(payload)
+        if len(self._d1_rows) + len(self._d7_rows) >= FORE_WRITE_ROWS:
+            self._flush()
+
+    def _flush(self) -> None:
+        with self.conn.cursor() as cur:
+            for (_, stage), rows in zip(self.TABLES, (self._d1_rows, self._d7_rows)):
+                if rows:
+                    cur.executemany(
+                        f"INSERT INTO {stage} "
+                        "(run_dttm, target_date, room_id, p_out, actual_out, correct) "
+                        "VALUES (%s, %s, %s, %s, %s, %s)",
+                        rows,
+                    )
+        self.staged += len(self._d1_rows) + len(self._d7_rows)
+        self._d1_rows = []
+        self._d7_rows = []
+
+    def _merge(self, cur, table: str, stage: str) -> Tuple[int, int, int]:
+        """스테이징과 대상 테이블을 자연키로 비교해 (수정, 신규, 삭제) 건수를 돌려준다."""
+
+        key_match = (
+            "s.run_dttm = t.run_dttm AND s.target_date = t.target_date AND s.room_id = t.room_id"
+        )
+        cur.execute(
+            f"""
+            UPDATE {table} t
+            JOIN {stage} s ON {key_match}
+            SET t.p_out = s.p_out, t.actual_out = s.actual_out, t.correct = s.correct,
+                t.updated_by = 'BATCH'
+            WHERE t.p_out <> s.p_out OR t.actual_out <> s.actual_out OR t.correct <> s.correct
+            """
+        )
+        updated = cur.rowcount
+        cur.execute(
+            f"""
+            INSERT INTO {table}
+                (run_dttm, target_date, room_id, p_out, actual_out, correct, created_by, updated_by)
+            SELECT s.run_dttm, s.target_date, s.room_id, s.p_out, s.actual_out, s.correct,
+                   'BATCH', 'BATCH'
+            FROM {stage} s
+            WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE {key_match})
+            """
+        )
+        inserted = cur.rowcount
+        date_marks = ", ".join(["%s"] * len(self.run_dates))
+        scope = (
+            " AND room_id IN (SELECT room_id FROM tmp_work_fore_scope)" if self.incremental else ""
+        )
+        cur.execute(
+            f"""
+            DELETE FROM {table}
+            WHERE run_dttm IN ({date_marks}){scope}
+              AND NOT EXISTS (
+                  SELECT 1 FROM {stage} s
+                  WHERE s.run_dttm = {table}.run_dttm
+                    AND s.target_date = {table}.target_date
+                    AND s.room_id = {table}.room_id
+              )
+            """,
+            tuple(self.run_dates),
+        )
+        return updated, inserted, cur.rowcount
+
+    def close(self, removed: Set[int]) -> None:
+        self._flush()
+        totals = [0, 0, 0]
+        with self.conn.cursor() as cur:
+            if self.incremental:
+                scope = sorted(self.rooms | set(removed))
+                if scope:
+                    cur.executemany(
+                        "INSERT INTO tmp_work_fore_scope (room_id) VALUES (%s)",
+                        [(room_id,) for room_id in scope],
+                    )
+            if not self.incremental or self.rooms or removed:
+                for table, stage in self.TABLES:
+                    for idx, count in enumerate(self._merge(cur, table, stage)):
+                        totals[idx] += count
+        span = (
+            f"기준일 {self.run_dates[0]}~{self.run_dates[-1]}, {len(self.run_dates)}일"
+            if len(self.run_dates) > 1
+            else f"기준일 {self.run_date}"
+        )
+        logging.info(
+            "예측 결과 %s건 DB 반영(%s): 수정 %s건, 신규 %s건, 삭제 %s건",
+            self.staged,
+            span,
+            *totals,
+        )
+
+
+class WorkHeaderSink(PredictionSink):
+    """예측 결과로 work_header를 생성/보정한다.
+
+    대상 일자 구간의 기존 헤더를 처음 한 번만 (date, room_id)로 조회해 두고, 묶음마다
+    메모리에서 비교한다. 신규·취소·수정은 모두 모았다가 ``close``에서 한 번에 반영하며, 신규는
+    ``insert_chunk``행씩 multi-row INSERT로 넣는다(조회 이후 다른 worker가 넣은 행은
+    ``HEADER_INSERT_UPSERT``로 수정 처리). 스트림(ICS 다운로드) 동안에는 work_header에 쓰지 않으므로
+    새 행과 유니크 인덱스 gap 잠금이 네트워크 단계 내내 잡혀 있지 않다. 커밋은 기본적으로
+    호출자가 실행 끝에 한 번 하며, ``commit_per_date``이면 일자별로 반영·커밋한다.
+
+    취소 규칙은 기존과 같다: 어떤 객실이든 생성/보정 대상이 있는 일자에 대해서만,
+    대상이 아닌 기존 헤더(수동 수정 제외)를 취소한다. 그 일자 여부는 스트림이 끝나야
+    확정되므로 취소 후보는 ``close``에서 판단한다. 증분 모드에서는 구간 전체 일자를 대상 일자로 본다.
+    ``room_scope``를 주면(분산 worker의 lease 객실) 그 객실들의 헤더만 조회·정리한다.
+    """
+
+    def __init__(
+        self,
+        conn,
+        run_date: dt.date,
+        offsets: Sequence[int],
+        incremental: bool,
+        insert_chunk: int = HEADER_INSERT_CHUNK,
+        commit_per_date: bool = False,
+        room_scope: Optional[Sequence[int]] = None,
+    ) -> None:
+        self.conn = conn
+        self.insert_chunk = max(1, insert_chunk)
+        self.commit_per_date = commit_per_date
+        self.run_date = run_date
+        self.offsets = set(offsets)
+        self.dates = sorted(run_date + dt.timedelta(days=offset) for offset in self.offsets)
+        self.incremental = incremental
+        self.room_scope = sorted(room_scope) if room_scope is not None else None
+        self.desired_dates: Set[dt.date] = set(self.dates) if self.incremental else set()
+        self.streamed: Set[int] = set()
+        self.existing: Optional[Dict[Tuple[dt.date, int], Dict]] = None
+        self.existing_by_room: Dict[int, List[Tuple[dt.date, Dict]]] = {}
+        self.cancel_candidates: List[Tuple[dt.date, int]] = []
+        self.to_insert: List[Tuple[dt.date, Room, int, int]] = []
+        self.to_update: List[Tuple[dt.date, Tuple]] = []
+        self.stats: Dict[dt.date, List[int]] = {}
+
+    def _desired(self, batch: PredictionBatch) -> Dict[dt.date, Dict[int, Tuple[Room, int, int]]]:
+        desired: Dict[dt.date, Dict[int, Tuple[Room, int, int]]] = {}
+        for room, target_date, has_checkin, has_checkout in batch.header_rows():
+            offset = (target_date - self.run_date).days
+            if offset not in self.offsets:
+                continue
+
+            include_checkin = offset in (0, 1)
+            if has_checkout:
+                desired.setdefault(target_date, {})[room.id] = (room, 0, 1)
+            if include_checkin and has_checkin:
+                room_entries = desired.setdefault(target_date, {})
+                # 동일 일자/객실에 대해 청소 작업을 우선 반영하고, 없을 때만 상태확인 작업을 기록한다.
+                if room.id not in room_entries:
+                    room_entries[room.id] = (room, 1, 0)
+        return desired
+
+    def _load_existing(self) -> Dict[Tuple[dt.date, int], Dict]:
+        """대상 일자 구간(및 room_scope)의 기존 헤더를 한 번의 쿼리로 (date, room_id) 색인한다."""
+
+        if self.existing is not None:
+            return self.existing
+        existing: Dict[Tuple[dt.date, int], Dict] = {}
+        date_marks = ", ".join(["%s"] * len(self.dates))
+        sql = f"""
+            SELECT id, date, room_id, cleaning_yn, cancel_yn, manual_upt_yn,
+                   condition_check_yn, checkin_time, checkout_time,
+                   amenities_qty, blanket_qty, requirements
+            FROM work_header
+            WHERE date IN ({date_marks})
+            """
+        params: List[object] = list(self.dates)
+        if self.room_scope is not None:
+            if not self.room_scope:
+                self.existing = existing
+                return existing
+            sql += f" AND room_id IN ({', '.join(['%s'] * len(self.room_scope))})"
+            params.extend(self.room_scope)
+        with self.conn.cursor(dictionary=True) as cur:
+            cur.execute(sql, tuple(params))
+            for row in cur.fetchall():
+                key = (to_date(row["date"]), int(row["room_id"]))
+                if key not in existing:
+                    existing[key] = row
+                    self.existing_by_room.setdefault(key[1], []).append((key[0], row))
+        self.existing = existing
+        return existing
+
+    def _stat(self, target_date: dt.date, index: int, count: int = 1) -> None:
+        self.stats.setdefault(target_date, [0, 0, 0])[index] += count
+
+    def write(self, batch: PredictionBatch) -> None:
+        room_ids = set(batch.room_ids())
+        if not room_ids:
+            return
+        self.streamed.update(room_ids)
+        desired = self._desired(batch)
+        self.desired_dates.update(desired)
+        existing_map = self._load_existing()
+
+        for target_date, entries in desired.items():
+            for room_id, (room, condition_check, cleaning) in entries.items():
+                existing = existing_map.get((target_date, room_id))
+                if not existing:
+                    self.to_insert.append((target_date, room, condition_check, cleaning))
+                    self._stat(target_date, 0)
+                    continue
+                if existing.get("manual_upt_yn") == 1:
+                    continue
+
+                requirements_text = "상태확인" if condition_check else None
+                needs_update = False
+
+                if existing.get("cancel_yn"):
+                    needs_update = True
+                if int(existing.get("cleaning_yn", -1)) != cleaning:
+                    needs_update = True
+                if existing.get("condition_check_yn") != condition_check:
+                    needs_update = True
+                if existing.get("checkin_time") != room.checkin_time:
+                    needs_update = True
+                if existing.get("checkout_time") != room.checkout_time:
+                    needs_update = True
+                if int(existing.get("amenities_qty") or 0) != room.bed_count:
+                    needs_update = True
+                if int(existing.get("blanket_qty") or 0) != room.bed_count:
+                    needs_update = True
+                if (existing.get("requirements") or None) != requirements_text:
+                    needs_update = True
+
+                if needs_update:
+                    self.to_update.append(
+                        (
+                            target_date,
+                            (
+                                cleaning,
+                                condition_check,
+                                room.bed_count,
+                                room.bed_count,
+                                room.checkin_time,
+                                room.checkout_time,
+                                requirements_text,
+                                "BATCH",
+                                int(existing["id"]),
+                            ),
+                        )
+                    )
+                    self._stat(target_date, 2)
+
+        for room_id in sorted(room_ids):
+            for target_date, row in self.existing_by_room.get(room_id, ()):
+                if room_id in desired.get(target_date, {}):
+                    continue
+                if row.get("manual_upt_yn") == 1 or row.get("cancel_yn"):
+                    continue
+                self.cancel_candidates.append((target_date, int(row["id"])))
+
+    def _execute(
+        self,
+        cur,
+        to_insert: Sequence[Tuple[dt.date, Room, int, int]],
+        to_cancel: Sequence[Tuple[dt.date, int]],
+        to_update: Sequence[Tuple[dt.date, Tuple]],
+    ) -> None:
+        if not self.commit_per_date:
+            self._apply(
+                cur, to_insert, [pk for _, pk in to_cancel], [row for _, row in to_update]
+            )
+            return
+        dates = sorted(
+            {entry[0] for entry in to_insert}
+            | {target_date for target_date, _ in to_cancel}
+            | {target_date for target_date, _ in to_update}
+        )
+        for target_date in dates:
+            self._apply(
+                cur,
+                [entry for entry in to_insert if entry[0] == target_date],
+                [pk for day, pk in to_cancel if day == target_date],
+                [row for day, row in to_update if day == target_date],
+            )
+            self.conn.commit()
+
+    def _apply(
+        self,
+        cur,
+        to_insert: Sequence[Tuple[dt.date, Room, int, int]],
+        to_cancel: Sequence[int],
+        to_update: Sequence[Tuple],
+    ) -> None:
+        if to_cancel:
+            cur.executemany(
+                "UPDATE work_header SET cancel_yn=1, updated_by=%s WHERE id=%s",
+                [("BATCH", pk) for pk in to_cancel],
+            )
+        if to_update:
+            cur.executemany(
+                """
+                UPDATE work_header
+                SET cleaning_yn=%s,
+                    condition_check_yn=%s,
+                    amenities_qty=%s,
+                    blanket_qty=%s,
+                    checkin_time=%s,
+                    checkout_time=%s,
+                    requirements=%s,
+                    cancel_yn=0,
+                    updated_by=%s
+                WHERE id=%s
+                """,
+                to_update,
+            )
+        for start in range(0, len(to_insert), self.insert_chunk):
+            chunk = to_insert[start : start + self.insert_chunk]
+            params: List[object] = []
+            for target_date, room, condition_check, cleaning in chunk:
+                params.extend(
+                    (
+                        target_date,
+                        room.id,
+                        room.bed_count,
+                        room.bed_count,
+                        condition_check,
+                        cleaning,
+                        room.checkin_time,
+                        room.checkout_time,
+                        "상태확인" if condition_check else None,
+                        "BATCH",
+                        "BATCH",
+                    )
+                )
+            cur.execute(
+                """
+                INSERT INTO work_header
+                    (date, room_id, cleaner_id, butler_id,
+                     amenities_qty, blanket_qty, condition_check_yn,
+                     cleaning_yn, checkin_time, checkout_time,
+                     supply_yn, clening_flag, cleaning_end_time,
+                     supervising_end_time, requirements, cancel_yn, manual_upt_yn, created_by, updated_by)
+                VALUES
+                """
+                + ", ".join([HEADER_INSERT_ROW] * len(chunk))
+                + HEADER_INSERT_UPSERT,
+                params,
+            )
+
+    def close(self, removed: Set[int]) -> None:
+        # 취소 후보는 최종 대상 일자에 속할 때만 취소한다.
+        to_cancel = [
+            (target_date, pk)
+            for target_date, pk in self.cancel_candidates
+            if target_date in self.desired_dates
+        ]
+        self.cancel_candidates.clear()
+
+        # 스트림에 나오지 않은 객실(전체 모드: 비활성 객실, 증분 모드: 제거 객실)의 헤더 취소
+        if self.desired_dates and (not self.incremental or removed):
+            for (target_date, room_id), row in self._load_existing().items():
+                if target_date not in self.desired_dates or room_id in self.streamed:
+                    continue
+                if row.get("cancel_yn") or row.get("manual_upt_yn") == 1:
+                    continue
+                if self.incremental and room_id not in removed:
+                    continue
+                to_cancel.append((target_date, int(row["id"])))
+        for target_date, _ in to_cancel:
+            self._stat(target_date, 1)
+
+        if self.to_insert or to_cancel or self.to_update:
+            with self.conn.cursor() as cur:
+                self._execute(cur, self.to_insert, to_cancel, self.to_update)
+        self.to_insert = []
+        self.to_update = []
+
+        if not self.stats:
+            logging.info("work_header 생성/보정 대상 없음")
+            return
+        for target_date in sorted(self.stats):
+            inserted, cancelled, updated = self.stats[target_date]
+            logging.info(
+                "work_header 보정(target=%s): 신규 %s건, 취소 %s건, 수정 %s건",
+                target_date,
+                inserted,
+                cancelled,
+                updated,
+            )
+
+
+BookingInterval = Tuple[dt.datetime, dt.datetime]
+
+
+def diff_bookings(
+    previous: Sequence[BookingInterval], current: Sequence[BookingInterval]
+) -> List[Tuple[str, Optional[BookingInterval], Optional[BookingInterval]]]:
+    """이전/현재 병합 구간을 비교해 (change_type, 현재 구간, 이전 구간) 목록을 만든다.
+
+    그대로인 구간은 제외한다. 이전 구간과 겹치는 새 구간은 ``extend``(기간 변경), 겹치는
+    이전 구간이 없으면 ``insert``, 어떤 새 구간과도 짝지어지지 않은 이전 구간은 ``cancel``이다.
+    결과는 현재 구간(시작 순) 변경분 뒤에 cancel(시작 순)이 온다.
+    """
+
+    # 두 목록을 시작 시각 순으로 한 번씩만 훑는다. 현재 구간도 시작 순이므로, 어떤 현재 구간보다
+    # 먼저 끝난 이전 구간은 이후 현재 구간과도 겹치지 않아 바로 cancel로 확정할 수 있다.
+    prev_set = set(previous)
+    cur_set = set(current)
+    prev_left = sorted(p for p in previous if p not in cur_set)
+    deltas: List[Tuple[str, Optional[BookingInterval], Optional[BookingInterval]]] = []
+    cancels: List[Tuple[str, Optional[BookingInterval], Optional[BookingInterval]]] = []
+    j = 0
+    for cur in sorted(current):
+        if cur in prev_set:
+            continue
+        while j < len(prev_left) and prev_left[j][1] <= cur[0]:
+            cancels.append(("cancel", None, prev_left[j]))
+            j += 1
+        if j < len(prev_left) and prev_left[j][0] < cur[1]:
+            deltas.append(("extend", cur, prev_left[j]))
+            j += 1
+        else:
+            deltas.append(("insert", cur, None))
+    cancels.extend(("cancel", None, prev) for prev in prev_left[j:])
+    deltas.extend(cancels)
+    return deltas
+
+
+class BookingChangeFeed:
+    """객실별 병합 예약 구간을 work_booking_interval에 보관하고 변경분을 work_booking_delta에 남긴다.
+
+    기준일 0시 이후에 끝나는 구간만 비교하며(지난 예약은 취소로 보지 않음), ICS 다운로드가
+    하나라도 실패한 객실은 타임라인이 불완전하므로 비교하지 않고 이전 구간을 유지한다.
+    객실 ``SINK_BATCH_ROOMS``개 단위로 이전 구간을 조회하고 변경된 객실만 다시 쓴다.
+    묶음마다 커밋하므로 본 작업 트랜잭션과 섞이지 않게 풀에서 전용 커넥션을 받아 쓰고
+    ``close``에서 돌려준다.
+    """
+
+    def __init__(self, run_date: dt.date) -> None:
+        self.conn = get_db_connection(purpose="booking_feed")
+        self.run_date = run_date
+        self.run_at = dt.datetime.now(SEOUL).replace(tzinfo=None, microsecond=0)
+        self.cutoff = dt.datetime.combine(run_date, dt.time())
+        self.pending: Dict[int, List[BookingInterval]] = {}
+        self.skipped = 0
+        self.counts = {"insert": 0, "extend": 0, "cancel": 0}
+        with self.conn.cursor() as cur:
+            cur.execute(BOOKING_INTERVAL_TABLE_SQL)
+            cur.execute(BOOKING_DELTA_TABLE_SQL)
+        self.conn.commit()
+
+    def write(self, room: Room, events: Sequence[Event], complete: bool) -> None:
+        if not complete:
+            self.skipped += 1
+            return
+        intervals: Dict[dt.datetime, dt.datetime] = {}
+        for event in events:
+            start, end = event.start.replace(tzinfo=None), event.end.replace(tzinfo=None)
+            if end < self.cutoff:
+                continue
+            # 길이 0 구간 등으로 시작 시각이 겹치면(PK) 가장 늦은 종료 시각 하나로 합친다.
+            intervals[start] = max(end, intervals.get(start, end))
+        self.pending[room.id] = sorted(intervals.items())
+        if len(self.pending) >= SINK_BATCH_ROOMS:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        room_ids = sorted(self.pending)
+        marks = ", ".join(["%s"] * len(room_ids))
+        previous: Dict[int, Dict[BookingInterval, dt.date]] = {}
+        with self.conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT room_id, start_dttm, end_dttm, first_seen_date
+                FROM work_booking_interval
+                WHERE room_id IN ({marks}) AND end_dttm >= %s
+                """,
+                (*room_ids, self.cutoff),
+            )
+            for room_id, start, end, first_seen in cur.fetchall():
+                previous.setdefault(int(room_id), {})[(start, end)] = first_seen
+
+            delta_rows = []
+            interval_rows = []
+            rewrite: List[Tuple[int]] = []
+            for room_id in room_ids:
+                before = previous.get(room_id, {})
+                deltas = diff_bookings(sorted(before), self.pending[room_id])
+                if not deltas:
+                    continue
+                rewrite.append((room_id,))
+                carried: Dict[BookingInterval, dt.date] = {}
+                for change_type, cur_iv, prev_iv in deltas:
+                    self.counts[change_type] += 1
+                    if change_type == "extend":
+                        carried[cur_iv] = before[prev_iv]
+                    delta_rows.append(
+                        (
+                            self.run_at,
+                            self.run_date,
+                            room_id,
+                            change_type,
+                            cur_iv[0] if cur_iv else None,
+                            cur_iv[1] if cur_iv else None,
+                            prev_iv[0] if prev_iv else None,
+                            prev_iv[1] if prev_iv else None,
+                        )
+                    )
+                for interval in self.pending[room_id]:
+                    first_seen = before.get(interval) or carried.get(interval) or self.run_date
+                    interval_rows.append((room_id, interval[0], interval[1], first_seen, self.run_date))
+
+            if rewrite:
+                cur.executemany("DELETE FROM work_booking_interval WHERE room_id=%s", rewrite)
+            if interval_rows:
+                cur.executemany(
+                    "INSERT INTO work_booking_interval "
+                    "(room_id, start_dttm, end_dttm, first_seen_date, updated_date) "
+                    "VALUES (%s, %s, %s, %s, %s)",
+                    interval_rows,
+                )
+            if delta_rows:
+                cur.executemany(
+                    "INSERT INTO work_booking_delta "
+                    "(run_at, run_date, room_id, change_type, start_dttm, end_dttm, "
+                    "prev_start_dttm, prev_end_dttm) "
+                    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+                    delta_rows,
+                )
+        self.conn.commit()
+        self.pending.clear()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+            with self.conn.cursor() as cur:
+                cur.execute("DELETE FROM work_booking_interval WHERE end_dttm < %s", (self.cutoff,))
+            self.conn.commit()
+        finally:
+            self.conn.close()
+        logging.info(
+            "예약 변경분: 신규 %s건, 기간 변경 %s건, 취소 %s건 (다운로드 불완전으로 비교 제외 객실 %s건)",
+            self.counts["insert"],
+            self.counts["extend"],
+            self.counts["cancel"],
+            self.skipped,
+        )
+
+
+class CapacityRollup:
+    """구역 × 대상일 단위 장기(D+1..D+N) 청소 수요 집계(work_fore_capacity).
+
+    객실별 예측 행을 만들지 않고, 타임라인의 날짜 색인(out_times)에서 확정 퇴실만 골라
+    (구역, 대상일)별로 건수·weight를 누적한다. 기대값은 work_fore와 같은 정의로
+    확정 퇴실은 1, 나머지 객실은 해당 (horizon, 요일)의 p_out을 더한 값이며,
+    p_out이 객실과 무관하므로 구역별 객실 수·weight 합계만으로 한 번에 계산한다.
+    """
+
+    def __init__(self, conn, run_date: dt.date, horizon: int, p_out_table: POutTable) -> None:
+        self.conn = conn
+        self.run_date = run_date
+        self.horizon = horizon
+        self.p_out_table = p_out_table
+        self.first = run_date + dt.timedelta(days=1)
+        self.last = run_date + dt.timedelta(days=horizon)
+        # (sector, value) → [객실 수, weight 합계]
+        self.sectors: Dict[Tuple[str, str], List[int]] = {}
+        # (sector, value, target_date) → [확정 퇴실 수, 확정 퇴실 weight]
+        self.confirmed: Dict[Tuple[str, str, dt.date], List[int]] = {}
+
+    def add(self, room: Room, timeline: RoomTimeline) -> None:
+        key = (room.sector, room.sector_value)
+        totals = self.sectors.setdefault(key, [0, 0])
+        totals[0] += 1
+        totals[1] += room.weight
+        for target_date in timeline.out_times:
+            counts = self.confirmed.setdefault((*key, target_date), [0, 0])
+            counts[0] += 1
+            counts[1] += room.weight
+
+    def rows(self) -> Iterator[Tuple[dt.date, dt.date, str, str, int, int, int, int, int, float, float]]:
+        for offset in range(1, self.horizon + 1):
+            target_date = self.run_date + dt.timedelta(days=offset)
+            p_out, _, _ = self.p_out_table.lookup(offset, target_date.weekday())
+            for (sector, value), (room_count, weight_total) in sorted(self.sectors.items()):
+                out_count, out_weight = self.confirmed.get((sector, value, target_date), (0, 0))
+                yield (
+                    self.run_date,
+                    target_date,
+                    sector,
+                    value,
+                    offset,
+                    room_count,
+                    weight_total,
+                    out_count,
+                    out_weight,
+                    round(out_count + p_out * (room_count - out_count), 3),
+                    round(out_weight + p_out * (weight_total - out_weight), 3),
+                )
+
+    def save(self) -> int:
+        rows = list(self.rows())
+        with self.conn.cursor() as cur:
+            cur.execute(CAPACITY_TABLE_SQL)
+            cur.execute("DELETE FROM work_fore_capacity WHERE run_dttm=%s", (self.run_date,))
+            for start in range(0, len(rows), FORE_WRITE_ROWS):
+                cur.executemany(
+                    "INSERT INTO work_fore_capacity "
+                    "(run_dttm, target_date, basecode_sector, basecode_code, horizon, room_count, "
+                    "weight_total, confirmed_out, confirmed_weight, expected_out, expected_weight) "
+                    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                    rows[start : start + FORE_WRITE_ROWS],
+                )
+        self.conn.commit()
+        logging.info(
+            "장기 수요 집계 저장: D+1~D+%s, 구역 %s개, %s행",
+            self.horizon,
+            len(self.sectors),
+            len(rows),
+        )
+        return len(rows)
+
+
+class RoomJobQueue:
+    """work_fore_job 기반 객실 작업 큐(분산 모드).
+
+    coordinator가 기준일의 활성 객실을 pending으로 넣으면, worker는 객실 묶음을 lease로
+    점유해 처리한 뒤 done으로 바꾼다. lease가 만료된 객실(처리 중 죽은 worker)은 다른
+    worker가 다시 가져가고, ``JOB_MAX_ATTEMPTS``번 넘게 만료된 객실은 실패로 본다.
+    시각은 호스트 간 시계 차이를 피하려고 DB의 NOW()를 기준으로 한다.
+    """
+
+    def __init__(self, conn, run_date: dt.date) -> None:
+        self.conn = conn
+        self.run_date = run_date
+        with conn.cursor() as cur:
+            cur.execute(JOB_TABLE_SQL)
+        conn.commit()
+
+    def enqueue(self, room_ids: Sequence[int]) -> int:
+        with self.conn.cursor() as cur:
+            cur.execute("DELETE FROM work_fore_job WHERE run_dttm=%s", (self.run_date,))
+            if room_ids:
+                cur.executemany(
+                    "INSERT INTO work_fore_job (run_dttm, room_id) VALUES (%s, %s)",
+                    [(self.run_date, room_id) for room_id in room_ids],
+                )
+        self.conn.commit()
+        return len(room_ids)
+
+    def lease(self, worker_id: str, limit: int, lease_seconds: int) -> Tuple[str, List[int]]:
+        """대기/만료 객실을 최대 limit개 점유하고 (lease 토큰, 객실 id 목록)을 돌려준다."""
+
+        token = f"{worker_id}:{uuid.uuid4().hex[:8]}"
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE work_fore_job
+                SET status='leased', lease_owner=%s,
+                    lease_expires_at=NOW() + INTERVAL %s SECOND, attempts=attempts + 1
+                WHERE run_dttm=%s AND attempts < %s
+                  AND (status='pending' OR (status='leased' AND lease_expires_at < NOW()))
+                ORDER BY room_id
+                LIMIT %s
+                """,
+                (token, lease_seconds, self.run_date, JOB_MAX_ATTEMPTS, limit),
+            )
+            self.conn.commit()
+            cur.execute(
+                "SELECT room_id FROM work_fore_job "
+                "WHERE run_dttm=%s AND lease_owner=%s AND status='leased' ORDER BY room_id",
+                (self.run_date, token),
+            )
+            room_ids = [int(row[0]) for row in cur.fetchall()]
+        return token, room_ids
+
+    def renew(self, token: str, lease_seconds: int) -> None:
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "UPDATE work_fore_job SET lease_expires_at=NOW() + INTERVAL %s SECOND "
+                "WHERE run_dttm=%s AND lease_owner=%s AND status='leased'",
+                (lease_seconds, self.run_date, token),
+            )
+        self.conn.commit()
+
+    def complete(self, token: str) -> None:
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "UPDATE work_fore_job SET status='done', lease_expires_at=NULL "
+                "WHERE run_dttm=%s AND lease_owner=%s AND status='leased'",
+                (self.run_date, token),
+            )
+        self.conn.commit()
+
+    def summary(self) -> Dict[str, int]:
+        """상태별 객실 수: pending / leased(유효) / expired(재시도 대기) / failed / done."""
+
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT CASE
+                           WHEN status='leased' AND lease_expires_at < NOW() AND attempts >= %s
+                               THEN 'failed'
+                           WHEN status='leased' AND lease_expires_at < NOW() THEN 'expired'
+                           ELSE status
+                       END AS state,
+                       COUNT(*)
+                FROM work_fore_job
+                WHERE run_dttm=%s
+                GROUP BY state
+                """,
+                (JOB_MAX_ATTEMPTS, self.run_date),
+            )
+            return {str(row[0]): int(row[1]) for row in cur.fetchall()}
+
+
 # ------------------------------ Batch Runner ------------------------------
 class BatchRunner:
     def __init__(
@@ -731,6 +3043,13 @@ class BatchRunner:
         end_offset: int,
         keep_days: int,
         refresh_dn: Optional[int],
+        download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+        parse_workers: Optional[int] = None,
+        ics_source: Optional[IcsSnapshot] = None,
+        full: bool = False,
+        header_insert_chunk: int = HEADER_INSERT_CHUNK,
+        commit_per_date: bool = False,
     ) -> None:
         self.conn = conn
         self.run_date = run_date
@@ -739,192 +3058,713 @@ class BatchRunner:
         self.keep_days = keep_days
         self.model = load_model_variables(conn)
         self.refresh_dn = refresh_dn
+        # refresh 모드는 offset 구성이 달라 지문을 비교/갱신하지 않고 항상 전체 계산한다.
+        self.full = full or refresh_dn is not None
         self.expected_ics = 0
         self.downloaded_ics = 0
+        self.incomplete_rooms: Set[int] = set()
         self._ics_names: set[str] = set()
+        self.archive = IcsArchive(ICS_BASE)
+        self.http_cache = IcsHttpCache(ICS_HTTP_CACHE_DIR, self.archive)
+        self.event_cache = ParsedEventCache(ICS_EVENT_CACHE_DIR)
+        self.url_health = UrlHealthRegistry(URL_HEALTH_PATH)
+        self.ics_source = ics_source
+        self.downloader: Union[IcsDownloader, IcsSnapshot] = ics_source or IcsDownloader(
+            download_workers, per_host_limit, self.archive, self.http_cache, self.url_health
+        )
+        self.parse_workers = parse_workers
+        self.header_insert_chunk = header_insert_chunk
+        self.commit_per_date = commit_per_date
+        self._apply_rules: Optional[List[ApplyRule]] = None
+        self._deferred_manifest: Optional[Tuple[List[IcsTask], List[Optional[Path]]]] = None
+        # manifest에 남길 기준일. --ics-source 재생 시 기본 기준일로 쓰인다.
+        self.manifest_run_date = run_date
+
+    @contextmanager
+    def _single_transaction(self) -> Iterator[None]:
+        """블록 안의 본 작업 변경(sink·apply·지문)을 트랜잭션 하나로 묶어 끝에서 한 번 커밋한다.
+
+        sink와 보조 메서드는 커밋하지 않으므로(``--commit-per-date``의 일자별 커밋만 예외) 블록
+        안의 변경은 여기서만 반영된다. 예외가 나면 커밋하지 않고 main에서 롤백한다.
+        """
+
+        yield
+        self.conn.commit()
+
+    def _prune_archive(self) -> None:
+        if self.ics_source is None:
+            rotate_ics_dirs(self.keep_days)
+            self.http_cache.prune(self.keep_days)
+            self.event_cache.prune(self.keep_days)
+            self.archive.gc(self.keep_days, self.http_cache.referenced_digests())
+        else:
+            # 재생 중인 manifest/blob이 정리되지 않도록 보관소는 건드리지 않는다.
+            logging.info("ICS 스냅샷 재생 모드: %s", self.ics_source.describe())
+
+    def run(self) -> None:
+        """기본 실행. work_fore·work_header·apply·지문 변경을 한 트랜잭션으로 커밋한다."""
+
+        self._prune_archive()
+        # CREATE TABLE은 암묵적으로 커밋하므로 트랜잭션을 열기 전에 끝낸다.
+        ensure_fingerprint_table(self.conn)
+        with self._single_transaction():
+            self._run()
+
+    def _run(self) -> None:
+        rooms = fetch_rooms(self.conn, self.run_date)
+        self.expected_ics = sum(len(r.ical_urls) for r in rooms)
+        logging.info("ICS 기대 다운로드 수: %s", self.expected_ics)
+        offsets: List[int]
+        if self.refresh_dn is not None:
+            offsets = [self.refresh_dn]
+        else:
+            offsets = list(range(max(1, self.start_offset), self.end_offset + 1))
+
+        # refresh 모드에서도 동일 offsets를 후속 단계에 그대로 사용하도록 보관한다.
+        self.offsets = offsets
+
+        window_first = self.run_date + dt.timedelta(days=min(offsets))
+        window_last = self.run_date + dt.timedelta(days=max(offsets))
+        p_out_table = POutTable(self.model, offsets)
+        previous = {} if self.full else self._load_fingerprints()
+        sinks = self._open_sinks(offsets)
+        # 과거 스냅샷 재생은 현재 예약 상태와 비교할 수 없으므로 변경분을 만들지 않는다.
+        booking_feed = (
+            BookingChangeFeed(self.run_date) if self.ics_source is None else None
+        )
+        fingerprints: Dict[int, str] = {}
+        changed: Set[int] = set()
+        chunk = PredictionBatch()
+        for room, events in self._iter_room_events(rooms):
+            if booking_feed is not None:
+                booking_feed.write(room, events, room.id not in self.incomplete_rooms)
+            fingerprint = room_fingerprint(room, events, self.run_date, offsets, self.model)
+            fingerprints[room.id] = fingerprint
+            if not self.full and previous.get(room.id, ("", None))[0] == fingerprint:
+                continue
+            changed.add(room.id)
+            timeline = RoomTimeline.build(events, window_first, window_last)
+            append_room_predictions(chunk, room, timeline, self.run_date, offsets, p_out_table)
+            # 다운로드가 진행되는 동안에도 묶음 단위로 DB에 흘려보내 메모리를 일정하게 유지한다.
+            if len(chunk.rooms) >= SINK_BATCH_ROOMS:
+                for sink in sinks:
+                    sink.write(chunk)
+                chunk = PredictionBatch()
+        if len(chunk):
+            for sink in sinks:
+                sink.write(chunk)
+
+        removed: Set[int] = set()
+        sectors: Optional[Set[str]] = None
+        if not self.full:
+            removed = {rid for rid in previous if rid not in fingerprints}
+            scope = changed | removed
+            sectors = {room.sector for room in rooms if room.id in changed}
+            # 제거되었거나 구역이 바뀐 객실은 이전 구역도 다시 계산한다.
+            sectors.update(
+                previous[rid][1] for rid in scope if rid in previous and previous[rid][1]
+            )
+            logging.info(
+                "증분 모드: 변경 객실 %s/%s건, 제거 객실 %s건, 대상 구역 %s",
+                len(changed),
+                len(rooms),
+                len(removed),
+                sorted(sectors) or "-",
+            )
+        for sink in sinks:
+            sink.close(removed)
+        if booking_feed is not None:
+            booking_feed.close()
+
+        if self.refresh_dn is not None:
+            logging.info(
+                "refresh-d%s 모드: work_header만 갱신하고 accuracy/apply는 건너뜀",
+                self.refresh_dn,
+            )
+        else:
+            apply_dates = [
+                self.run_date + dt.timedelta(days=offset)
+                for offset in range(self.start_offset, self.end_offset + 1)
+            ]
+            if sectors is not None and not sectors:
+                # 가용 달력·근무 예외가 바뀌었을 수 있으므로 빈 butler 슬롯 배정은 항상 다시 한다.
+                logging.info("증분 모드: 변경된 구역이 없어 work_apply 슬롯 생성을 건너뜀(배정만 수행)")
+                self._assign_workers_to_apply(apply_dates)
+            else:
+                self._persist_work_apply_slots(apply_dates, sectors)
+
+        if self.refresh_dn is None:
+            self._save_fingerprints(rooms, fingerprints, previous)
+
+        logging.info(
+            "ICS 다운로드 결과: 기대 %s건 중 %s건", self.expected_ics, self.downloaded_ics
+        )
+        logging.info(
+            "ICS 파싱 캐시: 재사용 %s건, 신규 파싱 %s건",
+            self.event_cache.hits,
+            self.event_cache.misses,
+        )
+
+        if self.refresh_dn is not None:
+            self._apply_work_reservation_overrides()
+
+    def run_range(self, run_dates: Sequence[dt.date]) -> None:
+        """여러 기준일의 work_fore를 한 프로세스에서 다시 계산한다(과거 이력 재구성용).
+
+        객실·모델은 한 번만 읽고, ICS도 한 번만 내려받아(또는 --ics-source 재생) 파싱한
+        이벤트로 전체 기간의 타임라인을 만든 뒤 기준일마다 예측을 계산한다. 기준일별
+        work_fore_d1/d7만 교체하며 work_header·accuracy·apply·지문은 건드리지 않는다.
+        """
+
+        if self.ics_source is not None:
+            logging.info("ICS 스냅샷 재생 모드: %s", self.ics_source.describe())
+        else:
+            # self.run_date는 기간의 첫(과거) 기준일이므로, 실제로 내려받은 날짜로 manifest를 남겨
+            # 이후 --ics-source 재생이 엉뚱한 기준일을 기본값으로 쓰지 않게 한다.
+            self.manifest_run_date = seoul_today()
+        rooms = fetch_rooms(self.conn, self.run_date)
+        self.expected_ics = sum(len(r.ical_urls) for r in rooms)
+        offsets = list(range(max(1, self.start_offset), self.end_offset + 1))
+        self.offsets = offsets
+        window_first = run_dates[0] + dt.timedelta(days=min(offsets))
+        window_last = run_dates[-1] + dt.timedelta(days=max(offsets))
+        p_out_table = POutTable(self.model, offsets)
+        logging.info(
+            "기간 재계산: 기준일 %s~%s(%s일), 객실 %s건, ICS 기대 %s건",
+            run_dates[0],
+            run_dates[-1],
+            len(run_dates),
+            len(rooms),
+            self.expected_ics,
+        )
+
+        with self._single_transaction():
+            sink = WorkForeSink(self.conn, self.run_date, incremental=False, run_dates=run_dates)
+            chunks = {run_date: PredictionBatch() for run_date in run_dates}
+            pending = 0
+            for room, events in self._iter_room_events(rooms):
+                timeline = RoomTimeline.build(events, window_first, window_last)
+                for run_date in run_dates:
+                    append_room_predictions(
+                        chunks[run_date], room, timeline, run_date, offsets, p_out_table
+                    )
+                pending += 1
+                if pending >= SINK_BATCH_ROOMS:
+                    for run_date in run_dates:
+                        sink.write(chunks[run_date], run_date)
+                        chunks[run_date] = PredictionBatch()
+                    pending = 0
+            if pending:
+                for run_date in run_dates:
+                    sink.write(chunks[run_date], run_date)
+            sink.close(set())
+
+        logging.info(
+            "ICS 다운로드 결과: 기대 %s건 중 %s건", self.expected_ics, self.downloaded_ics
+        )
+        logging.info(
+            "ICS 파싱 캐시: 재사용 %s건, 신규 파싱 %s건",
+            self.event_cache.hits,
+            self.event_cache.misses,
+        )
+
+    def run_capacity(self, horizon: int) -> None:
+        """D+1..D+horizon 구역별 기대 퇴실 수·weight를 work_fore_capacity에 집계한다.
 
-    def run(self) -> None:
-        rotate_ics_dirs(self.keep_days)
-        ics_dir = ensure_ics_dir()
+        객실별 예측(work_fore)·헤더·apply·지문은 건드리지 않는 별도 집계 모드다.
+        """
+
+        if self.ics_source is not None:
+            logging.info("ICS 스냅샷 재생 모드: %s", self.ics_source.describe())
         rooms = fetch_rooms(self.conn, self.run_date)
         self.expected_ics = sum(len(r.ical_urls) for r in rooms)
-        logging.info("ICS 기대 다운로드 수: %s", self.expected_ics)
-        predictions: List[Prediction] = []
-        offsets: List[int]
-        if self.refresh_dn is not None:
-            offsets = [self.refresh_dn]
-        else:
-            offsets = list(range(max(1, self.start_offset), self.end_offset + 1))
+        rollup = CapacityRollup(
+            self.conn, self.run_date, horizon, POutTable(self.model, range(1, horizon + 1))
+        )
+        for room, events in self._iter_room_events(rooms):
+            rollup.add(room, RoomTimeline.build(events, rollup.first, rollup.last))
+        rollup.save()
 
-        # refresh 모드에서도 동일 offsets를 후속 단계에 그대로 사용하도록 보관한다.
+        logging.info(
+            "ICS 다운로드 결과: 기대 %s건 중 %s건", self.expected_ics, self.downloaded_ics
+        )
+
+    def _window_offsets(self) -> List[int]:
+        return list(range(max(1, self.start_offset), self.end_offset + 1))
+
+    def run_coordinator(self) -> None:
+        """분산 모드 1단계: 기준일의 활성 객실을 work_fore_job에 넣고 비활성 객실 예측을 지운다."""
+
+        rooms = fetch_rooms(self.conn, self.run_date)
+        queue = RoomJobQueue(self.conn, self.run_date)
+        queued = queue.enqueue([room.id for room in rooms])
+        # worker는 lease 객실만 비교·반영하므로, 비활성 객실의 기준일 예측은 여기서 지운다.
+        with self.conn.cursor() as cur:
+            for table, _ in WorkForeSink.TABLES:
+                cur.execute(
+                    f"""
+                    DELETE FROM {table}
+                    WHERE run_dttm=%s
+                      AND room_id NOT IN (
+                          SELECT room_id FROM work_fore_job WHERE run_dttm=%s
+                      )
+                    """,
+                    (self.run_date, self.run_date),
+                )
+        self.conn.commit()
+        logging.info("분산 모드 coordinator: 기준일 %s 객실 %s건 등록", self.run_date, queued)
+
+    def run_worker(self, worker_id: str, lease_rooms: int, lease_seconds: int) -> None:
+        """분산 모드 2단계: 객실 묶음을 lease로 가져와 다운로드·파싱·예측·헤더 보정을 한다.
+
+        묶음마다 work_fore/work_header/지문을 해당 객실만 비교해 쓰고 한 트랜잭션으로 커밋한 뒤
+        lease를 완료한다. 커밋 후 완료 전에 worker가 죽어 다른 worker가 같은 객실을 다시
+        처리하면 work_fore는 자연키 비교로, 헤더는 ``HEADER_INSERT_UPSERT``로 같은 결과가 된다.
+        lease 갱신·완료는 전용 커넥션(job_queue)에서 커밋하므로 DB 반영 단계 중에도 갱신한다.
+        대기·만료 객실이 모두 없어지면 종료한다.
+        """
+
+        self._prune_archive()
+        # CREATE TABLE은 암묵적으로 커밋하므로 lease 트랜잭션을 열기 전에 끝낸다.
+        ensure_fingerprint_table(self.conn)
+        room_by_id = {room.id: room for room in fetch_rooms(self.conn, self.run_date)}
+        queue_conn = get_db_connection(purpose="job_queue")
+        try:
+            queue = RoomJobQueue(queue_conn, self.run_date)
+            self._run_worker_leases(queue, room_by_id, worker_id, lease_rooms, lease_seconds)
+        finally:
+            queue_conn.close()
+
+    def _run_worker_leases(
+        self,
+        queue: RoomJobQueue,
+        room_by_id: Dict[int, Room],
+        worker_id: str,
+        lease_rooms: int,
+        lease_seconds: int,
+    ) -> None:
+        offsets = self._window_offsets()
         self.offsets = offsets
+        window_first = self.run_date + dt.timedelta(days=min(offsets))
+        window_last = self.run_date + dt.timedelta(days=max(offsets))
+        p_out_table = POutTable(self.model, offsets)
+        booking_feed = (
+            BookingChangeFeed(self.run_date) if self.ics_source is None else None
+        )
+        self._deferred_manifest = ([], [])
+        processed = 0
+        while True:
+            token, room_ids = queue.lease(worker_id, lease_rooms, lease_seconds)
+            if not room_ids:
+                summary = queue.summary()
+                if not (summary.get("pending") or summary.get("leased") or summary.get("expired")):
+                    break
+                logging.info("분산 모드 worker: 다른 worker 처리 대기 %s", summary)
+                time.sleep(JOB_POLL_SECONDS)
+                continue
 
-        for room in rooms:
-            events = self._collect_events(room, ics_dir)
-            for offset in offsets:
-                target_date = self.run_date + dt.timedelta(days=offset)
-                out_time = extract_out_time(events, target_date)
-                checkin_flag = has_checkin_on(events, target_date)
-                p_out, high = compute_p_out(self.model, offset, target_date.weekday())
-                borderline = self.model["borderline"]
-                if p_out >= high:
-                    label = "○"
-                elif p_out >= borderline:
-                    label = "△"
-                else:
-                    label = ""
-                has_checkout = out_time is not None
-                actual_observed = target_date == self.run_date
-                prediction = Prediction(
-                    room=room,
-                    target_date=target_date,
-                    horizon=offset,
-                    out_time=out_time,
-                    p_out=p_out,
-                    label=label,
-                    has_checkin=checkin_flag,
-                    has_checkout=has_checkout,
-                    actual_observed=actual_observed,
+            rooms = [room_by_id[rid] for rid in room_ids if rid in room_by_id]
+            self.expected_ics += sum(len(room.ical_urls) for room in rooms)
+            if len(rooms) < len(room_ids):
+                logging.info(
+                    "분산 모드 worker: 비활성 객실 %s건은 예측 없이 완료 처리",
+                    len(room_ids) - len(rooms),
                 )
-                predictions.append(prediction)
-        if self.refresh_dn is None:
-            self._persist_predictions(predictions)
-        self._persist_work_header(predictions, offsets)
+            renewed_at = time.monotonic()
+
+            def keep_lease(force: bool = False) -> None:
+                nonlocal renewed_at
+                if force or time.monotonic() - renewed_at > lease_seconds / 3:
+                    queue.renew(token, lease_seconds)
+                    renewed_at = time.monotonic()
+
+            chunk = PredictionBatch()
+            fingerprints: List[Tuple[int, Optional[str], dt.date, str]] = []
+            for room, events in self._iter_room_events(rooms):
+                if booking_feed is not None:
+                    booking_feed.write(room, events, room.id not in self.incomplete_rooms)
+                fingerprints.append(
+                    (
+                        room.id,
+                        room.sector,
+                        self.run_date,
+                        room_fingerprint(room, events, self.run_date, offsets, self.model),
+                    )
+                )
+                timeline = RoomTimeline.build(events, window_first, window_last)
+                append_room_predictions(chunk, room, timeline, self.run_date, offsets, p_out_table)
+                keep_lease()
+            # DB 반영 중 lease가 만료되어 다른 worker와 겹치지 않도록 시작 전과 sink 단계마다 갱신한다.
+            keep_lease(force=True)
+            with self._single_transaction():
+                sinks: List[PredictionSink] = [
+                    WorkForeSink(self.conn, self.run_date, incremental=True),
+                    self._header_sink(offsets, incremental=True, room_scope=room_ids),
+                ]
+                for sink in sinks:
+                    if len(chunk):
+                        sink.write(chunk)
+                        keep_lease()
+                    sink.close(set())
+                    keep_lease()
+                # 다음 단일 실행(증분 모드)이 이 객실들을 변경 없음으로 판단할 수 있도록 지문도 남긴다.
+                self._upsert_fingerprints(fingerprints)
+            queue.complete(token)
+            processed += len(room_ids)
+            logging.info("분산 모드 worker(%s): 객실 %s건 완료(누적 %s건)", worker_id, len(room_ids), processed)
+
+        if booking_feed is not None:
+            booking_feed.close()
+        tasks, blobs = self._deferred_manifest
+        self._deferred_manifest = None
+        if tasks:
+            self._write_manifest(tasks, blobs)
+        logging.info(
+            "분산 모드 worker(%s) 종료: 객실 %s건, ICS %s/%s건",
+            worker_id,
+            processed,
+            self.downloaded_ics,
+            self.expected_ics,
+        )
 
-        if self.refresh_dn is not None:
+    def run_reduce(self, wait_seconds: int) -> None:
+        """분산 모드 3단계: 모든 객실이 끝나면 비활성 객실 헤더·지문 정리와 work_apply 생성을 한다."""
+
+        queue = RoomJobQueue(self.conn, self.run_date)
+        deadline = time.monotonic() + wait_seconds
+        while True:
+            summary = queue.summary()
+            if not summary:
+                raise RuntimeError(
+                    f"work_fore_job에 기준일 {self.run_date} 작업이 없습니다(coordinator 미실행)"
+                )
+            if summary.get("failed"):
+                raise RuntimeError(
+                    f"재시도 한도({JOB_MAX_ATTEMPTS}회)를 넘긴 객실이 {summary['failed']}건 있습니다"
+                )
+            unfinished = sum(summary.get(key, 0) for key in ("pending", "leased", "expired"))
+            if not unfinished:
+                break
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"미완료 객실 {unfinished}건이 남아 reduce를 중단합니다: {summary}")
+            logging.info("분산 모드 reduce: worker 완료 대기 %s", summary)
+            time.sleep(JOB_POLL_SECONDS)
+
+        offsets = self._window_offsets()
+        self.offsets = offsets
+        active = {room.id for room in fetch_rooms(self.conn, self.run_date)}
+        first = self.run_date + dt.timedelta(days=min(offsets))
+        last = self.run_date + dt.timedelta(days=max(offsets))
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT date, room_id, manual_upt_yn FROM work_header "
+                "WHERE date BETWEEN %s AND %s AND cancel_yn = 0",
+                (first, last),
+            )
+            live = [(to_date(row[0]), int(row[1]), row[2] == 1) for row in cur.fetchall()]
+        # 단일 실행(WorkHeaderSink.close 전체 모드)처럼 생성/보정 대상이 있던 일자에서만 취소한다.
+        # worker가 보정을 마친 뒤이므로, 활성 객실의 자동(비수동) 헤더가 살아 있는 일자가 그 일자다.
+        reconciled = {day for day, room_id, manual in live if room_id in active and not manual}
+        stale = {
+            room_id
+            for day, room_id, manual in live
+            if room_id not in active and day in reconciled and not manual
+        }
+        ensure_fingerprint_table(self.conn)
+        inactive_fingerprints = [(rid,) for rid in sorted(set(self._load_fingerprints()) - active)]
+        with self._single_transaction():
+            # worker 헤더 보정은 lease 객실만 다루므로, 비활성 객실 헤더 취소는 여기서 한 번에 한다.
+            if stale:
+                self._header_sink(
+                    sorted((day - self.run_date).days for day in reconciled),
+                    incremental=True,
+                    room_scope=sorted(stale),
+                ).close(stale)
+            if inactive_fingerprints:
+                with self.conn.cursor() as cur:
+                    cur.executemany(
+                        "DELETE FROM work_fore_fingerprint WHERE room_id=%s", inactive_fingerprints
+                    )
             logging.info(
-                "refresh-d%s 모드: work_header만 갱신하고 accuracy/apply는 건너뜀",
-                self.refresh_dn,
+                "분산 모드 reduce: 완료 객실 %s건, 비활성 객실 %s건 헤더 정리, 지문 %s건 삭제",
+                summary.get("done", 0),
+                len(stale),
+                len(inactive_fingerprints),
+            )
+            self._persist_work_apply_slots(
+                [
+                    self.run_date + dt.timedelta(days=offset)
+                    for offset in range(self.start_offset, self.end_offset + 1)
+                ]
             )
-        else:
-            for offset in range(self.start_offset, self.end_offset + 1):
-                self._persist_work_apply_slots(
-                    self.run_date + dt.timedelta(days=offset), predictions
-                )
 
-        logging.info(
-            "ICS 다운로드 결과: 기대 %s건 중 %s건", self.expected_ics, self.downloaded_ics
+    def _header_sink(
+        self,
+        offsets: Sequence[int],
+        incremental: bool,
+        room_scope: Optional[Sequence[int]] = None,
+    ) -> WorkHeaderSink:
+        return WorkHeaderSink(
+            self.conn,
+            self.run_date,
+            offsets,
+            incremental,
+            insert_chunk=self.header_insert_chunk,
+            commit_per_date=self.commit_per_date,
+            room_scope=room_scope,
         )
 
-        if self.refresh_dn is not None:
-            self._apply_work_reservation_overrides()
-
-    def _collect_events(self, room: Room, ics_dir: Path) -> List[Event]:
-        all_events: List[Event] = []
-        for idx, url in enumerate(room.ical_urls, start=1):
-            base_name = build_ics_filename(room, url, self._ics_names, idx)
-            path = download_ics(url, ics_dir, base_name)
-            if not path:
-                continue
-            self.downloaded_ics += 1
-            raw_events = parse_events(path)
-            raw_events.sort(key=lambda e: e.start)
-            all_events.extend(raw_events)
+    def _open_sinks(self, offsets: Sequence[int]) -> List[PredictionSink]:
+        incremental = not self.full
+        sinks: List[PredictionSink] = []
+        if self.refresh_dn is None:
+            sinks.append(WorkForeSink(self.conn, self.run_date, incremental))
+        sinks.append(self._header_sink(offsets, incremental))
+        return sinks
 
-        if not all_events:
-            return []
+    def _build_download_tasks(self, rooms: Sequence[Room]) -> List[IcsTask]:
+        tasks: List[IcsTask] = []
+        for room in rooms:
+            for idx, url in enumerate(room.ical_urls, start=1):
+                # 파일명 충돌 회피(_2, _3...)가 결정적으로 동작하도록 객실 순서대로 미리 할당한다.
+                base_name = build_ics_filename(room, url, self._ics_names, idx)
+                tasks.append(IcsTask(room_id=room.id, url=url, filename=base_name))
+        return tasks
+
+    def _parse_workers_for(self, ics_count: int) -> int:
+        """파싱 프로세스 수. --parse-workers를 생략하면 ICS가 많을 때만 프로세스 풀을 쓴다."""
+
+        if self.parse_workers is not None:
+            return self.parse_workers
+        # spawn된 프로세스마다 icalendar/mysql을 다시 import하므로 --refresh-dn 같은 소량 갱신은
+        # 현재 프로세스에서 파싱하는 편이 빠르다.
+        return DEFAULT_PARSE_WORKERS if ics_count >= PARSE_POOL_MIN_ICS else 1
+
+    def _iter_room_events(
+        self, rooms: Sequence[Room]
+    ) -> Iterator[Tuple[Room, List[Event]]]:
+        """다운로드(스레드) → 파싱·병합(프로세스 풀) → 예측 단계를 파이프라인으로 잇는다.
+
+        URL이 모두 끝난 객실부터 파싱 작업을 제출하되 in-flight 작업 수를 제한(역압)하고,
+        결과는 객실 조회 순서대로 내보내 기존과 같은 순서의 예측을 만든다.
+        """
+
+        tasks = self._build_download_tasks(rooms)
+        slot_of: List[int] = []
+        remaining: Dict[int, int] = {}
+        paths_by_room: Dict[int, List[Optional[Path]]] = {}
+        blobs: List[Optional[Path]] = [None] * len(tasks)
+        for task in tasks:
+            slot_of.append(remaining.get(task.room_id, 0))
+            remaining[task.room_id] = slot_of[-1] + 1
+            paths_by_room.setdefault(task.room_id, []).append(None)
+
+        parse_workers = self._parse_workers_for(len(tasks))
+        pool: Optional[ProcessPoolExecutor] = None
+        if parse_workers > 1:
+            pool = ProcessPoolExecutor(
+                max_workers=parse_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        logging.info("ICS 파싱 프로세스: %s개 (ICS %s건)", max(1, parse_workers), len(tasks))
+        queue_bound = max(1, parse_workers) * PARSE_QUEUE_PER_WORKER
+        inflight: Set[Future] = set()
+        results: Dict[int, Union[Future, List[Event]]] = {}
+        next_pos = 0
+
+        def submit(room_id: int) -> None:
+            paths = [p for p in paths_by_room.pop(room_id, []) if p]
+            if pool is None:
+                results[room_id] = collect_room_events(paths, self.event_cache)
+                return
+            while len(inflight) >= queue_bound:
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                inflight.difference_update(done)
+            future = pool.submit(
+                parse_room_events, [str(p) for p in paths], str(self.event_cache.base_dir)
+            )
+            inflight.add(future)
+            results[room_id] = future
+
+        def drain(block: bool) -> Iterator[Tuple[Room, List[Event]]]:
+            nonlocal next_pos
+            while next_pos < len(rooms):
+                room = rooms[next_pos]
+                entry = results.get(room.id)
+                if entry is None:
+                    return
+                if isinstance(entry, Future):
+                    if not block and not entry.done():
+                        return
+                    blob, hits, misses = entry.result()
+                    inflight.discard(entry)
+                    self.event_cache.hits += hits
+                    self.event_cache.misses += misses
+                    events = decode_events(blob)
+                else:
+                    events = entry
+                del results[room.id]
+                next_pos += 1
+                yield room, events
 
-        all_events.sort(key=lambda e: e.start)
-        merged: List[Event] = []
-        for event in all_events:
-            if not merged:
-                merged.append(event)
-                continue
-            last = merged[-1]
-            if event.start < last.end:  # overlap → 병합 (back-to-back은 병합하지 않음)
-                merged[-1] = Event(start=last.start, end=max(last.end, event.end))
+        started = dt.datetime.now(dt.timezone.utc)
+        try:
+            for room in rooms:
+                if not room.ical_urls:
+                    results[room.id] = []
+            for idx, path in self.downloader.iter_fetch(tasks):
+                task = tasks[idx]
+                blobs[idx] = path
+                if path:
+                    self.downloaded_ics += 1
+                    paths_by_room[task.room_id][slot_of[idx]] = path
+                else:
+                    self.incomplete_rooms.add(task.room_id)
+                remaining[task.room_id] -= 1
+                if remaining[task.room_id] == 0:
+                    submit(task.room_id)
+                yield from drain(block=False)
+
+            elapsed = (dt.datetime.now(dt.timezone.utc) - started).total_seconds()
+            if self.ics_source is not None:
+                logging.info(
+                    "ICS 스냅샷 로딩 완료: %s/%s건(스냅샷에 없음 %s건), %.1fs",
+                    self.downloaded_ics,
+                    len(tasks),
+                    self.ics_source.missing,
+                    elapsed,
+                )
             else:
-                merged.append(event)
-        return merged
-
-    def _persist_predictions(self, predictions: Sequence[Prediction]) -> None:
-        """Persist forecast outputs."""
-
-        logging.info("예측 결과 %s건 DB 저장", len(predictions))
-        d1_rows: List[Tuple[dt.date, dt.date, int, float, int, int, str, str]] = []
-        d7_rows: List[Tuple[dt.date, dt.date, int, float, int, int, str, str]] = []
-
-        for pred in predictions:
-            payload = (
-                self.run_date,
-                pred.target_date,
-                pred.room.id,
-                round(pred.p_out, 3),
-                int(pred.has_checkout) if pred.actual_observed else 0,
-                int(pred.correct) if pred.actual_observed else 0,
-                "BATCH",
-                "BATCH",
+                logging.info(
+                    "ICS 병렬 다운로드 완료: %s/%s건(304 재사용 %s건), %.1fs (workers=%s, per-host=%s)",
+                    self.downloaded_ics,
+                    len(tasks),
+                    self.http_cache.not_modified,
+                    elapsed,
+                    self.downloader.max_workers,
+                    self.downloader.per_host_limit,
+                )
+                self._write_manifest(tasks, blobs)
+                self.url_health.save()
+                self._log_degraded_urls()
+            yield from drain(block=True)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    def _log_degraded_urls(self) -> None:
+        degraded = self.url_health.degraded()
+        if not degraded:
+            return
+        logging.warning(
+            "ICS URL 이상 %s건 (회로 차단 확인 %s건)", len(degraded), self.url_health.probed
+        )
+        for url, entry in degraded:
+            p95 = UrlHealthRegistry.p95(entry.get("latencies") or [])
+            logging.warning(
+                "  room=%s host=%s 연속 실패 %s회%s p95=%s 마지막 성공=%s",
+                entry.get("room_id"),
+                ics_host(url),
+                entry.get("fail_streak", 0),
+                "(차단)" if self.url_health.is_open(url) else "",
+                f"{p95:.1f}s" if p95 is not None else "-",
+                entry.get("last_success") or "-",
             )
 
-            # 1일/7일 외 구간은 가장 가까운 테이블에 저장한다.
-            if pred.horizon <= 3:
-                d1_rows.append(payload)
-            else:
-                d7_rows.append(payload)
+    def _write_manifest(self, tasks: Sequence[IcsTask], blobs: Sequence[Optional[Path]]) -> None:
+        if self._deferred_manifest is not None:
+            # 분산 worker는 lease 묶음마다가 아니라 종료 시 manifest 하나로 모아 기록한다.
+            self._deferred_manifest[0].extend(tasks)
+            self._deferred_manifest[1].extend(blobs)
+            return
+        try:
+            manifest = self.archive.write_manifest(self.manifest_run_date, tasks, blobs)
+        except OSError as exc:
+            logging.warning("ICS manifest 저장 실패: %s", exc)
+            return
+        logging.info(
+            "ICS 보관: manifest=%s, 신규 blob %s건, 중복 제거 %s건",
+            manifest.name,
+            self.archive.stored,
+            self.archive.deduplicated,
+        )
 
+    def _load_fingerprints(self) -> Dict[int, Tuple[str, Optional[str]]]:
         with self.conn.cursor() as cur:
-            cur.execute(
-                "DELETE FROM work_fore_d1 WHERE run_dttm=%s",
-                (self.run_date,),
-            )
-            cur.execute(
-                "DELETE FROM work_fore_d7 WHERE run_dttm=%s",
-                (self.run_date,),
-            )
+            cur.execute("SELECT room_id, fingerprint, basecode_sector FROM work_fore_fingerprint")
+            return {int(row[0]): (row[1], row[2]) for row in cur.fetchall()}
 
-            if d1_rows:
-                cur.executemany(
-                    "INSERT INTO work_fore_d1 "
-                    "(run_dttm, target_date, room_id, p_out, actual_out, correct, created_by, updated_by) "
-                    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
-                    d1_rows,
-                )
+    def _save_fingerprints(
+        self,
+        rooms: Sequence[Room],
+        fingerprints: Dict[int, str],
+        previous: Dict[int, Tuple[str, Optional[str]]],
+    ) -> None:
+        """DB 반영이 모두 끝난 뒤 지문을 기록한다(같은 트랜잭션이라 중간 실패 시 함께 롤백)."""
+
+        rows = [
+            (room.id, room.sector, self.run_date, fingerprints[room.id])
+            for room in rooms
+            if previous.get(room.id, ("", None)) != (fingerprints[room.id], room.sector)
+        ]
+        removed = [(rid,) for rid in previous if rid not in fingerprints]
+        with self.conn.cursor() as cur:
+            if self.full:
+                cur.execute("DELETE FROM work_fore_fingerprint")
+            elif removed:
+                cur.executemany("DELETE FROM work_fore_fingerprint WHERE room_id=%s", removed)
+        self._upsert_fingerprints(rows)
 
-            if d7_rows:
-                cur.executemany(
-                    "INSERT INTO work_fore_d7 "
-                    "(run_dttm, target_date, room_id, p_out, actual_out, correct, created_by, updated_by) "
-                    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
-                    d7_rows,
-                )
+    def _upsert_fingerprints(self, rows: Sequence[Tuple[int, Optional[str], dt.date, str]]) -> None:
+        """(room_id, sector, run_dttm, fingerprint) 행을 room_id 기준으로 넣거나 갱신한다."""
 
-        self.conn.commit()
+        if not rows:
+            return
+        with self.conn.cursor() as cur:
+            cur.executemany(
+                "INSERT INTO work_fore_fingerprint "
+                "(room_id, basecode_sector, run_dttm, fingerprint) VALUES (%s, %s, %s, %s) "
+                "ON DUPLICATE KEY UPDATE basecode_sector=VALUES(basecode_sector), "
+                "run_dttm=VALUES(run_dttm), fingerprint=VALUES(fingerprint)",
+                rows,
+            )
 
     def _persist_work_apply_slots(
-        self, target_date: dt.date, predictions: Sequence[Prediction]
+        self,
+        target_dates: Sequence[dt.date],
+        sectors: Optional[Set[str]] = None,
     ) -> None:
-        rules = fetch_apply_rules(self.conn)
+        """대상 일자 전체의 apply 슬롯을 한 번에 만든다.
+
+        규칙은 실행당 한 번, 구역 가중치·기존 슬롯 수는 일자 구간 전체를 묶은 집계 쿼리
+        한 번씩으로 읽고, 부족한 슬롯을 모아 executemany로 넣은 뒤 일자별로 배정한다.
+        """
+
+        if not target_dates:
+            return
+        first_date, last_date = min(target_dates), max(target_dates)
+        if self._apply_rules is None:
+            self._apply_rules = fetch_apply_rules(self.conn)
+        rules = self._apply_rules
         if not rules:
             logging.info("work_apply_rules 데이터가 없어 apply 생성이 스킵됩니다.")
-            self._assign_workers_to_apply(target_date)
-            return
-        sector_weights = fetch_sector_weights_from_headers(self.conn, target_date)
-        if not sector_weights:
-            logging.info(
-                "sector 가중치 합계가 없어 apply 생성이 스킵됩니다 (target=%s)",
-                target_date,
-            )
-            self._assign_workers_to_apply(target_date)
+            self._assign_workers_to_apply(target_dates)
             return
+        weights_by_date = fetch_sector_weights_from_headers(self.conn, first_date, last_date)
+        existing_counts = fetch_existing_apply_counts(self.conn, first_date, last_date)
 
-        existing_counts: Dict[Tuple[str, int], Tuple[int, int]] = {}
-        with self.conn.cursor(dictionary=True) as cur:
-            cur.execute(
-                """
-                SELECT basecode_sector, position,
-                       COUNT(*) AS cnt, COALESCE(MAX(seq), 0) AS max_seq
-                FROM work_apply
-                WHERE work_date=%s
-                GROUP BY basecode_sector, position
-                """,
-                (target_date,),
-            )
-            for row in cur.fetchall():
-                key = (row["basecode_sector"], int(row["position"]))
-                existing_counts[key] = (int(row["cnt"]), int(row["max_seq"]))
-
-        with self.conn.cursor() as cur:
+        slots: List[Tuple[dt.date, str, str, int, int, str, str]] = []
+        for target_date in target_dates:
+            sector_weights = weights_by_date.get(target_date)
+            if not sector_weights:
+                logging.info(
+                    "sector 가중치 합계가 없어 apply 생성이 스킵됩니다 (target=%s)",
+                    target_date,
+                )
+                continue
             for sector_code, sector_value, weight_sum in sector_weights:
+                if sectors is not None and sector_code not in sectors:
+                    continue
                 rule = _match_rule(weight_sum, rules)
                 if not rule:
                     logging.info(
@@ -935,8 +3775,9 @@ class BatchRunner:
                     continue
 
                 for position, required in ((2, rule.butler_count), (1, rule.cleaner_count)):
-                    key = (sector_code, position)
-                    current_count, max_seq = existing_counts.get(key, (0, 0))
+                    current_count, max_seq = existing_counts.get(
+                        (target_date, sector_code, position), (0, 0)
+                    )
                     if current_count >= required:
                         continue
 
@@ -945,65 +3786,61 @@ class BatchRunner:
                         seq += 1
                         if seq > 127:
                             raise ValueError(f"apply seq overflow for sector {sector_code}: {seq}")
-
-                        cur.execute(
-                            """
-                            INSERT INTO work_apply
-                                (work_date, basecode_sector, basecode_code, seq, position, worker_id, created_by, updated_by)
-                            VALUES (%s, %s, %s, %s, %s, NULL, %s, %s)
-                            """,
-                            (target_date, sector_code, sector_value, seq, position, "BATCH", "BATCH"),
+                        slots.append(
+                            (target_date, sector_code, sector_value, seq, position, "BATCH", "BATCH")
                         )
-        self.conn.commit()
-        self._assign_workers_to_apply(target_date)
 
-    def _assign_workers_to_apply(self, target_date: dt.date) -> None:
-        weekday = (target_date.weekday() + 1) % 7
-        with self.conn.cursor(dictionary=True) as cur:
-            cur.execute(
-                """
-                SELECT id, basecode_sector, seq, worker_id
-                FROM work_apply
-                WHERE work_date=%s AND position=2
-                ORDER BY basecode_sector ASC, seq ASC
-                """,
-                (target_date,),
-            )
-            apply_rows = cur.fetchall()
+        if slots:
+            with self.conn.cursor() as cur:
+                cur.executemany(
+                    """
+                    INSERT INTO work_apply
+                        (work_date, basecode_sector, basecode_code, seq, position, worker_id, created_by, updated_by)
+                    VALUES (%s, %s, %s, %s, %s, NULL, %s, %s)
+                    """,
+                    slots,
+                )
+        logging.info(
+            "work_apply 슬롯 %s건 생성 (%s~%s)", len(slots), first_date, last_date
+        )
+        self._assign_workers_to_apply(target_dates)
 
-        if not apply_rows:
-            return
+    def _assign_workers_to_apply(self, target_dates: Sequence[dt.date]) -> None:
+        """대상 일자 전체의 butler(position=2) 빈 슬롯을 한 번에 배정한다.
 
-        used_workers: set[int] = {
-            int(row["worker_id"]) for row in apply_rows if row.get("worker_id")
-        }
+        슬롯과 가용 달력은 기간 전체를 한 번씩 읽고, solve_butler_assignments로 일자 간
+        공정 분배까지 고려해 배정한 뒤 executemany 한 번으로 반영한다(커밋은 호출자).
+        """
 
-        weekly_workers: List[int] = []
-        with self.conn.cursor() as cur:
+        if not target_dates:
+            return
+        open_rows: Dict[dt.date, List[Dict]] = {}
+        busy: Dict[dt.date, Set[int]] = {}
+        load: Dict[int, int] = {}
+        with self.conn.cursor(dictionary=True) as cur:
             cur.execute(
                 """
-                SELECT DISTINCT worker_id
-                FROM worker_weekly_pattern
-                WHERE weekday=%s
-                ORDER BY worker_id DESC
+                SELECT id, work_date, basecode_sector, seq, position, worker_id
+                FROM work_apply
+                WHERE work_date BETWEEN %s AND %s
                 """,
-                (weekday,),
+                (min(target_dates), max(target_dates)),
             )
-            weekly_workers = [int(row[0]) for row in cur.fetchall() if row[0] is not None]
-
-        available_workers = [w.id for w in fetch_available_workers(self.conn, target_date)]
-        available_workers.sort(reverse=True)
-
-        worker_queue: List[int] = []
-        for worker_id in weekly_workers + available_workers:
-            if worker_id in used_workers:
-                continue
-            if worker_id in worker_queue:
+            rows = cur.fetchall()
+        dates = set(target_dates)
+        for row in rows:
+            work_date = to_date(row["work_date"])
+            if work_date not in dates:
                 continue
-            worker_queue.append(worker_id)
-
-        if not worker_queue:
-            logging.info("배정 가능한 worker가 없어 work_apply worker_id 업데이트를 건너뜁니다.")
+            if row.get("worker_id"):
+                # work_apply는 (work_date, worker_id)가 유일하므로 position과 무관하게 제외한다.
+                worker_id = int(row["worker_id"])
+                busy.setdefault(work_date, set()).add(worker_id)
+                if int(row["position"]) == 2:
+                    load[worker_id] = load.get(worker_id, 0) + 1
+            elif int(row["position"]) == 2:
+                open_rows.setdefault(work_date, []).append(row)
+        if not open_rows:
             return
 
         def _sector_key(row: Dict) -> tuple:
@@ -1014,202 +3851,35 @@ class BatchRunner:
                 sector_val = math.inf
             return (sector_val, row.get("seq", 0))
 
-        assigned = 0
-        worker_idx = 0
-        with self.conn.cursor() as cur:
-            for row in sorted(apply_rows, key=_sector_key):
-                if row.get("worker_id"):
-                    continue
-                if worker_idx >= len(worker_queue):
-                    break
-                worker_id = worker_queue[worker_idx]
-                worker_idx += 1
-                cur.execute(
-                    "UPDATE work_apply SET worker_id=%s, updated_by=%s WHERE id=%s",
-                    (worker_id, "BATCH", int(row["id"])),
-                )
-                assigned += 1
+        open_slots = {
+            day: [int(row["id"]) for row in sorted(day_rows, key=_sector_key)]
+            for day, day_rows in open_rows.items()
+        }
+        calendar = fetch_availability_calendar(self.conn, sorted(open_slots))
+        assignments, cap = solve_butler_assignments(open_slots, calendar, busy, load)
+        if not assignments:
+            logging.info("배정 가능한 worker가 없어 work_apply worker_id 업데이트를 건너뜁니다.")
+            return
 
-        if assigned:
-            self.conn.commit()
+        with self.conn.cursor() as cur:
+            cur.executemany(
+                "UPDATE work_apply SET worker_id=%s, updated_by=%s WHERE id=%s AND worker_id IS NULL",
+                [(worker_id, "BATCH", slot_id) for worker_id, slot_id in assignments],
+            )
+        assigned_ids = {slot_id for _, slot_id in assignments}
+        for day in sorted(open_slots):
             logging.info(
-                "work_apply(worker) 배정 완료: date=%s, position=2, assigned=%s",
-                target_date,
-                assigned,
+                "work_apply(worker) 배정 완료: date=%s, position=2, assigned=%s/%s",
+                day,
+                sum(1 for slot_id in open_slots[day] if slot_id in assigned_ids),
+                len(open_slots[day]),
             )
-
-    def _persist_work_header(
-        self, predictions: Sequence[Prediction], offsets: Sequence[int]
-    ) -> None:
-
-        desired: Dict[dt.date, Dict[int, Tuple[Prediction, int, int]]] = {}
-        for pred in predictions:
-            offset = (pred.target_date - self.run_date).days
-            if offset not in offsets:
-                continue
-
-            include_checkin = offset in (0, 1)
-            if pred.has_checkout:
-                desired.setdefault(pred.target_date, {})[pred.room.id] = (
-                    pred,
-                    0,
-                    1,
-                )
-            if include_checkin and pred.has_checkin:
-                room_entries = desired.setdefault(pred.target_date, {})
-                # 동일 일자/객실에 대해 청소 작업을 우선 반영하고, 없을 때만 상태확인 작업을 기록한다.
-                if pred.room.id not in room_entries:
-                    room_entries[pred.room.id] = (
-                        pred,
-                        1,
-                        0,
-                    )
-
-        if not desired:
-            logging.info("work_header 생성/보정 대상 없음")
-            return
-
-        with self.conn.cursor(dictionary=True) as cur:
-            for target_date, entries in desired.items():
-                cur.execute(
-                    """
-                    SELECT id, room_id, cleaning_yn, cancel_yn, manual_upt_yn,
-                           condition_check_yn, checkin_time, checkout_time,
-                           amenities_qty, blanket_qty, requirements
-                    FROM work_header
-                    WHERE date=%s
-                    """,
-                    (target_date,),
-                )
-                existing_rows = cur.fetchall()
-                existing_map: Dict[int, Dict] = {}
-                for row in existing_rows:
-                    room_id = int(row["room_id"])
-                    if room_id not in existing_map:
-                        existing_map[room_id] = row
-
-                to_insert: List[Tuple[Prediction, int, int]] = []
-                to_cancel: List[int] = []
-                to_update: List[Tuple[int, int, int, int, dt.time, dt.time, Optional[str], int]] = []
-
-                for room_id, entry in entries.items():
-                    existing = existing_map.get(room_id)
-                    if not existing:
-                        to_insert.append(entry)
-                        continue
-                    if existing.get("manual_upt_yn") == 1:
-                        continue
-
-                    pred, condition_check, cleaning = entry
-                    requirements_text = "상태확인" if condition_check else None
-                    needs_update = False
-
-                    if existing.get("cancel_yn"):
-                        needs_update = True
-                    if int(existing.get("cleaning_yn", -1)) != cleaning:
-                        needs_update = True
-                    if existing.get("condition_check_yn") != condition_check:
-                        needs_update = True
-                    if existing.get("checkin_time") != pred.room.checkin_time:
-                        needs_update = True
-                    if existing.get("checkout_time") != pred.room.checkout_time:
-                        needs_update = True
-                    if int(existing.get("amenities_qty") or 0) != pred.room.bed_count:
-                        needs_update = True
-                    if int(existing.get("blanket_qty") or 0) != pred.room.bed_count:
-                        needs_update = True
-                    if (existing.get("requirements") or None) != requirements_text:
-                        needs_update = True
-
-                    if needs_update:
-                        to_update.append(
-                            (
-                                cleaning,
-                                condition_check,
-                                pred.room.bed_count,
-                                pred.room.bed_count,
-                                pred.room.checkin_time,
-                                pred.room.checkout_time,
-                                requirements_text,
-                                "BATCH",
-                                int(existing["id"]),
-                            )
-                        )
-
-                for room_id, row in existing_map.items():
-                    if room_id in entries:
-                        continue
-                    if row.get("manual_upt_yn") == 1:
-                        continue
-                    if not row.get("cancel_yn"):
-                        to_cancel.append(int(row["id"]))
-
-                if not (to_insert or to_cancel or to_update):
-                    logging.info("work_header 변경 없음 (target=%s)", target_date)
-                    continue
-
-                logging.info(
-                    "work_header 보정(target=%s): 신규 %s건, 취소 %s건, 수정 %s건",
-                    target_date,
-                    len(to_insert),
-                    len(to_cancel),
-                    len(to_update),
-                )
-
-                if to_cancel:
-                    cur.executemany(
-                        "UPDATE work_header SET cancel_yn=1, updated_by=%s WHERE id=%s",
-                        [("BATCH", pk) for pk in to_cancel],
-                    )
-                if to_update:
-                    cur.executemany(
-                        """
-                        UPDATE work_header
-                        SET cleaning_yn=%s,
-                            condition_check_yn=%s,
-                            amenities_qty=%s,
-                            blanket_qty=%s,
-                            checkin_time=%s,
-                            checkout_time=%s,
-                            requirements=%s,
-                            cancel_yn=0,
-                            updated_by=%s
-                        WHERE id=%s
-                        """,
-                        to_update,
-                    )
-                for pred, condition_check, cleaning in to_insert:
-                    requirements_text = "상태확인" if condition_check else None
-                    cur.execute(
-                        """
-                        INSERT INTO work_header
-                            (date, room_id, cleaner_id, butler_id,
-                             amenities_qty, blanket_qty, condition_check_yn,
-                             cleaning_yn, checkin_time, checkout_time,
-                             supply_yn, clening_flag, cleaning_end_time,
-                             supervising_end_time, requirements, cancel_yn, manual_upt_yn, created_by, updated_by)
-                        VALUES
-                            (%s, %s, NULL, NULL,
-                             %s, %s, %s,
-                             %s, %s, %s,
-                             0, 1, NULL,
-                             NULL, %s, 0, 0, %s, %s)
-                        """,
-                        (
-                            pred.target_date,
-                            pred.room.id,
-                            pred.room.bed_count,
-                            pred.room.bed_count,
-                            condition_check,
-                            cleaning,
-                            pred.room.checkin_time,
-                            pred.room.checkout_time,
-                            requirements_text,
-                            "BATCH",
-                            "BATCH",
-                        ),
-                    )
-                self.conn.commit()
+        logging.info(
+            "work_apply(worker) 기간 배정: %s건, worker당 상한 %s일, 최대 배정 %s일",
+            len(assignments),
+            cap,
+            max(load.values()),
+        )
 
     def _apply_work_reservation_overrides(self) -> None:
         """Reflect open work_reservation rows into work_header on refresh runs."""
@@ -1324,7 +3994,6 @@ class BatchRunner:
                 "UPDATE work_reservation SET work_id=%s, updated_by=%s, reflect_yn=1 WHERE id=%s",
                 reservations_to_mark,
             )
-            self.conn.commit()
 
             logging.info(
                 "work_reservation 반영 완료: 업데이트 %s건, reflect 완료 %s건, 수동 수정 스킵 %s건",
@@ -1333,102 +4002,48 @@ class BatchRunner:
                 skipped_manual,
             )
 
-    def _persist_accuracy(self, predictions: Sequence[Prediction]) -> None:
-        buckets: Dict[str, List[Prediction]] = {"D-1": [], "D-7": []}
-        for pred in predictions:
-            if not pred.actual_observed:
-                continue
-            if pred.horizon == 1:
-                buckets["D-1"].append(pred)
-            elif pred.horizon == 7:
-                buckets["D-7"].append(pred)
-        with self.conn.cursor() as cur:
-            cur.execute("DELETE FROM work_fore_accuracy WHERE date=%s", (self.run_date,))
-            for horizon, preds in buckets.items():
-                if not preds:
-                    continue
-                total = len(preds)
-                correct = sum(1 for p in preds if p.correct)
-                predicted_positive = sum(1 for p in preds if p.predicted_positive)
-                true_positive = sum(
-                    1 for p in preds if p.predicted_positive and p.has_checkout
-                )
-                actual_positive = sum(1 for p in preds if p.has_checkout)
-                acc = correct / total if total else 0
-                prec = true_positive / predicted_positive if predicted_positive else 0
-                rec = true_positive / actual_positive if actual_positive else 0
-                f1 = (2 * prec * rec / (prec + rec)) if (prec + rec) else 0
-                cur.execute(
-                    """
-                    INSERT INTO work_fore_accuracy
-                        (date, horizon, acc, prec, rec, f1, n, created_by, updated_by)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        self.run_date,
-                        "D-1" if horizon == "D-1" else "D-7",
-                        round(acc, 4),
-                        round(prec, 4),
-                        round(rec, 4),
-                        round(f1, 4),
-                        total,
-                        "BATCH",
-                        "BATCH",
-                    ),
-                )
-        self.conn.commit()
-
-    def _adjust_threshold(self, predictions: Sequence[Prediction]) -> None:
-        d1_preds = [p for p in predictions if p.horizon == 1 and p.actual_observed]
-        if not d1_preds:
-            return
-        predicted_positive = sum(1 for p in d1_preds if p.predicted_positive)
-        if not predicted_positive:
-            return
-        true_positive = sum(
-            1 for p in d1_preds if p.predicted_positive and p.has_checkout
-        )
-        precision = true_positive / predicted_positive
-        before = self.model["d1_high"]
-        after = before
-        if precision < D1_PRECISION_TARGET - 0.05:
-            after = clamp(before + D1_HIGH_STEP, D1_HIGH_MIN, D1_HIGH_MAX)
-        elif precision > D1_PRECISION_TARGET + 0.05:
-            after = clamp(before - D1_HIGH_STEP, D1_HIGH_MIN, D1_HIGH_MAX)
-        if after == before:
-            logging.info("컷오프 조정 불필요 (precision=%.2f)", precision)
-            return
-        self.model["d1_high"] = after
-        save_model_variables(self.conn, self.model)
-        logging.info("d1_high 조정: %.2f → %.2f (precision=%.2f)", before, after, precision)
-        with self.conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO work_fore_tuning
-                    (`date`, `horizon`, `variable`, `before`, `after`, `delta`, `explanation`, created_by, updated_by)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    self.run_date,
-                    "D-1",
-                    "d1_high",
-                    round(before, 4),
-                    round(after, 4),
-                    round(after - before, 6),
-                    f"precision={precision:.2f}",
-                    "BATCH",
-                    "BATCH",
-                ),
-            )
-        self.conn.commit()
-
 
 def main() -> None:
     configure_logging()
-    logging.info("배치 시작")
     args = parse_args()
+    if args.verify_ics_parser is not None:
+        target = args.verify_ics_parser
+        suffixes = (".ics", IcsArchive.BLOB_SUFFIX)
+        paths = (
+            sorted(p for p in target.rglob("*") if p.name.endswith(suffixes))
+            if target.is_dir()
+            else [target]
+        )
+        raise SystemExit(1 if verify_fast_parser(paths) else 0)
+    if args.benchmark_p_out is not None:
+        horizons = list(range(max(1, args.start_offset), args.end_offset + 1))
+        identical, scalar_elapsed, table_elapsed = benchmark_p_out(
+            DEFAULT_MODEL, horizons, args.benchmark_p_out
+        )
+        logging.info(
+            "p_out 벤치마크(객실 %s × horizon %s): 스칼라 %.3fs, 표 조회 %.3fs, 결과 일치=%s",
+            args.benchmark_p_out,
+            len(horizons),
+            scalar_elapsed,
+            table_elapsed,
+            identical,
+        )
+        raise SystemExit(0 if identical else 1)
+    logging.info("배치 시작")
+    snapshot = IcsSnapshot(args.ics_source) if args.ics_source is not None else None
     today_seoul = seoul_today()
-    run_date = args.run_date or today_seoul
+    run_dates: List[dt.date] = []
+    if args.run_date_range is not None:
+        range_start, range_end = args.run_date_range
+        run_dates = [
+            range_start + dt.timedelta(days=i) for i in range((range_end - range_start).days + 1)
+        ]
+    run_date = (
+        (run_dates[0] if run_dates else None)
+        or args.run_date
+        or (snapshot.run_date if snapshot else None)
+        or today_seoul
+    )
     now_seoul = dt.datetime.now(dt.timezone.utc).astimezone(SEOUL)
     logging.info("기준일(KST): %s (현재 서울 시각 %s)", run_date, now_seoul.strftime("%Y-%m-%d %H:%M:%S"))
     start_dttm = dt.datetime.now(dt.timezone.utc)
@@ -1443,9 +4058,35 @@ def main() -> None:
             end_offset=args.end_offset,
             keep_days=args.ics_keep_days,
             refresh_dn=args.refresh_dn,
+            download_workers=args.download_workers,
+            per_host_limit=args.per_host_limit,
+            parse_workers=args.parse_workers,
+            ics_source=snapshot,
+            full=args.full,
+            header_insert_chunk=args.header_insert_chunk,
+            commit_per_date=args.commit_per_date,
         )
-        runner.run()
-        if args.refresh_dn is not None:
+        if run_dates:
+            runner.run_range(run_dates)
+        elif args.capacity_horizon is not None:
+            runner.run_capacity(args.capacity_horizon)
+        elif args.role == "coordinator":
+            runner.run_coordinator()
+        elif args.role == "worker":
+            runner.run_worker(args.worker_id, args.lease_rooms, args.lease_seconds)
+        elif args.role == "reduce":
+            runner.run_reduce(args.reduce_wait)
+        else:
+            runner.run()
+        if run_dates:
+            logging.info("기간 재계산 실행이므로 웹푸시 enqueue를 건너뜀")
+        elif args.capacity_horizon is not None:
+            logging.info("장기 수요 집계 실행이므로 웹푸시 enqueue를 건너뜀")
+        elif args.role in ("coordinator", "worker"):
+            logging.info("분산 모드 %s 단계이므로 웹푸시 enqueue를 건너뜀(reduce에서 전송)", args.role)
+        elif snapshot is not None:
+            logging.info("ICS 스냅샷 재생 실행이므로 웹푸시 enqueue를 건너뜀")
+        elif args.refresh_dn is not None:
             enqueue_web_push_scenario(
                 {
                     "scenario": "CLEAN_SCHEDULE",
@@ -1474,29 +4115,41 @@ def main() -> None:
         except Exception:
             logging.error("에러 발생 후 롤백 실패", exc_info=True)
         try:
-            log_error(conn, message=str(exc), stacktrace=stack, run_date=run_date)
+            log_error(message=str(exc), stacktrace=stack, run_date=run_date)
         except Exception:
             logging.error("에러로그 저장 중 추가 오류 발생", exc_info=True)
         raise
     finally:
         try:
             log_batch_execution(
-                conn,
                 app_name="db_forecasting",
                 start_dttm=start_dttm,
                 end_dttm=dt.datetime.now(dt.timezone.utc),
                 end_flag=end_flag,
                 context={
                     "run_date": str(run_date),
+                    "run_date_range": (
+                        [str(run_dates[0]), str(run_dates[-1])] if run_dates else None
+                    ),
                     "start_offset": args.start_offset,
                     "end_offset": args.end_offset,
                     "refresh_dn": args.refresh_dn,
+                    "capacity_horizon": args.capacity_horizon,
+                    "role": args.role,
+                    "worker_id": args.worker_id if args.role == "worker" else None,
+                    "full": args.full,
+                    "ics_source": snapshot.describe() if snapshot else None,
                 },
             )
         except Exception:
             logging.error("배치 실행 로그 저장 실패", exc_info=True)
-        if conn is not None and conn.is_connected():
-            conn.close()
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                logging.warning("DB 커넥션 반환 실패", exc_info=True)
+        log_connection_stats("db_forecasting")
+        log_pool_stats("db_forecasting")
 
 
 if __name__ == "__main__":
@@ -22,12 +22,13 @@ from typing import Dict, List, Optional, Sequence, Tuple
 
 import mysql.connector
 
+from batch_db import get_db_connection, log_pool_stats
+from batch_http import log_connection_stats
 from db_forecasting import (
     D1_PRECISION_TARGET,
     WEEKDAY_BASE,
     clamp,
     ensure_model_table,
-    get_db_connection,
     log_batch_execution,
     load_model_variables,
     save_model_variables,
@@ -81,7 +82,6 @@ def configure_logging() -> None:
 
 
 def log_error(
-    conn: Optional[mysql.connector.MySQLConnection],
     *,
     message: str,
     stacktrace: str,
@@ -90,8 +90,11 @@ def log_error(
 ) -> None:
     """etc_errorLogs에 에러 정보를 기록한다."""
 
-    log_conn = conn if conn is not None and conn.is_connected() else get_db_connection(autocommit=True)
-    should_close = log_conn is not conn
+    try:
+        log_conn = get_db_connection(autocommit=True, purpose="log")
+    except Exception:
+        logging.error("에러로그 저장 실패", exc_info=True)
+        return
     try:
         with log_conn.cursor() as cur:
             cur.execute(
@@ -117,8 +120,7 @@ def log_error(
     except Exception:
         logging.error("에러로그 저장 실패", exc_info=True)
     finally:
-        if should_close:
-            log_conn.close()
+        log_conn.close()
 
 
 def parse_args() -> argparse.Namespace:
@@ -457,14 +459,13 @@ def main() -> None:
         end_flag = 2
         logging.error("모델 학습 배치 비정상 종료", exc_info=exc)
         try:
-            log_error(conn, message=str(exc), stacktrace=traceback.format_exc())
+            log_error(message=str(exc), stacktrace=traceback.format_exc())
         except Exception:
             logging.error("에러로그 저장 실패", exc_info=True)
         raise
     finally:
         try:
             log_batch_execution(
-                conn,
                 app_name="train_model",
                 start_dttm=start_dttm,
                 end_dttm=dt.datetime.now(dt.timezone.utc),
@@ -478,8 +479,13 @@ def main() -> None:
             )
         except Exception:
             logging.error("배치 실행 로그 저장 실패", exc_info=True)
-        if conn is not None and conn.is_connected():
-            conn.close()
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                logging.warning("DB 커넥션 반환 실패", exc_info=True)
+        log_connection_stats("train_model")
+        log_pool_stats("train_model")
 
 
 if __name__ == "__main__":
@@ -21,13 +21,19 @@ import mysql.connector
 from mysql.connector import errors as mysql_errors
 import requests
 
+from batch_db import get_db_connection, log_pool_stats
+from batch_http import (
+    enqueue_web_push_scenario,
+    get_session,
+    http_timeout,
+    log_connection_stats,
+)
+
 KST = dt.timezone(dt.timedelta(hours=9))
 MAX_OPENAI_CALLS_PER_RUN = 3
 COMMENT_DB_LIMIT = 240
 SCHEMA_CSV_PATH = Path(__file__).resolve().parent.parent / "docsForCodex" / "schema.csv"
-WEB_PUSH_SCENARIO_URL = os.environ.get(
-    "WEB_PUSH_SCENARIO_ENDPOINT", "http://localhost:3200/api/push/scenario"
-)
+OPENAI_READ_TIMEOUT = 30
 
 
 def configure_logging() -> None:
@@ -45,51 +51,6 @@ def configure_logging() -> None:
     )
 
 
-def enqueue_web_push_scenario(payload: Dict[str, object], *, label: str) -> None:
-    """웹푸시 시나리오 큐에 작업을 추가한다."""
-
-    logging.info(
-        "웹푸시 enqueue 시도(%s): url=%s payload=%s",
-        label,
-        WEB_PUSH_SCENARIO_URL,
-        json.dumps(payload, ensure_ascii=False),
-    )
-    try:
-        resp = requests.post(WEB_PUSH_SCENARIO_URL, json=payload, timeout=5)
-    except Exception as exc:  # pylint: disable=broad-except
-        logging.warning(
-            "웹푸시 enqueue 실패(%s): url=%s error=%s", label, WEB_PUSH_SCENARIO_URL, exc
-        )
-        return
-
-    if resp.status_code >= 400:
-        logging.warning(
-            "웹푸시 enqueue 응답 오류(%s): status=%s body=%s",
-            label,
-            resp.status_code,
-            resp.text,
-        )
-        return
-
-    try:
-        data = resp.json()
-    except Exception:  # pylint: disable=broad-except
-        logging.info(
-            "웹푸시 enqueue 완료(%s) - JSON 파싱 실패: status=%s body=%s",
-            label,
-            resp.status_code,
-            resp.text,
-        )
-        return
-
-    created = data.get("created")
-    attempted = data.get("attempted")
-    if not created:
-        logging.info("웹푸시 enqueue dedup/스킵(%s): attempted=%s", label, attempted)
-    else:
-        logging.info("웹푸시 enqueue 완료(%s): created=%s attempted=%s", label, created, attempted)
-
-
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="클리너 랭킹 업데이트 배치")
     parser.add_argument(
@@ -106,21 +67,7 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def get_db_connection(*, autocommit: bool = False) -> mysql.connector.MySQLConnection:
-    cfg = dict(
-        host=os.environ.get("DB_HOST", "127.0.0.1"),
-        port=int(os.environ.get("DB_PORT", 3306)),
-        user=os.environ.get("DB_USER", "root"),
-        password=os.environ.get("DB_PASSWORD", ""),
-        database=os.environ.get("DB_NAME", "tenaCierge"),
-        autocommit=autocommit,
-    )
-    logging.info("DB 접속 정보: %s:%s/%s", cfg["host"], cfg["port"], cfg["database"])
-    return mysql.connector.connect(**cfg)
-
-
 def log_batch_execution(
-    conn: Optional[mysql.connector.MySQLConnection],
     *,
     app_name: str,
     start_dttm: dt.datetime,
@@ -130,8 +77,11 @@ def log_batch_execution(
 ) -> None:
     """배치 실행 이력을 DB에 적재한다."""
 
-    log_conn = conn if conn is not None and conn.is_connected() else get_db_connection(autocommit=True)
-    should_close = log_conn is not conn
+    try:
+        log_conn = get_db_connection(autocommit=True, purpose="log")
+    except Exception:
+        logging.error("배치 실행 로그 저장 실패", exc_info=True)
+        return
     try:
         with log_conn.cursor() as cur:
             cur.execute(
@@ -167,8 +117,7 @@ def log_batch_execution(
     except Exception:
         logging.error("배치 실행 로그 저장 실패", exc_info=True)
     finally:
-        if should_close:
-            log_conn.close()
+        log_conn.close()
 
 
 def _safe_json_loads(value: object) -> object:
@@ -1088,14 +1037,14 @@ class CleanerRankingBatch:
                 break
             self.openai_calls += 1
             try:
-                resp = requests.post(
+                resp = get_session().post(
                     "https://api.openai.com/v1/chat/completions",
                     headers={
                         "Authorization": f"Bearer {self.openai_api_key}",
                         "Content-Type": "application/json",
                     },
                     json=request_body,
-                    timeout=30,
+                    timeout=http_timeout(OPENAI_READ_TIMEOUT),
                 )
                 if resp.status_code in {400, 401, 403, 404, 422}:
                     logging.warning(
@@ -1192,10 +1141,12 @@ class CleanerRankingBatch:
         level: int = 2,
         context: Optional[Dict[str, object]] = None,
     ) -> None:
-        log_conn = (
-            self.conn if hasattr(self, "conn") and self.conn and self.conn.is_connected() else get_db_connection(autocommit=True)
-        )
-        should_close = log_conn is not getattr(self, "conn", None)
+        # 본 작업 트랜잭션을 커밋하지 않도록 에러로그는 별도 커넥션으로 남긴다.
+        try:
+            log_conn = get_db_connection(autocommit=True, purpose="log")
+        except Exception:  # pragma: no cover - 실패 시 로그만 남김
+            logging.error("에러로그 저장 실패", exc_info=True)
+            return
         try:
             with log_conn.cursor() as cur:
                 cur.execute(
@@ -1224,8 +1175,7 @@ class CleanerRankingBatch:
         except Exception:  # pragma: no cover - 실패 시 로그만 남김
             logging.error("에러로그 저장 실패", exc_info=True)
         finally:
-            if should_close:
-                log_conn.close()
+            log_conn.close()
 
     def _persist_comments(
         self, comments: Dict[int, str], evaluations: Dict[int, List[Dict[str, object]]]
@@ -1614,7 +1564,6 @@ def main() -> None:
     finally:
         try:
             log_batch_execution(
-                conn,
                 app_name="update_cleaner_ranking",
                 start_dttm=start_dttm,
                 end_dttm=dt.datetime.now(dt.timezone.utc),
@@ -1623,8 +1572,13 @@ def main() -> None:
             )
         except Exception:
             logging.error("배치 실행 로그 저장 실패", exc_info=True)
-        if conn is not None and conn.is_connected():
-            conn.close()
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                logging.warning("DB 커넥션 반환 실패", exc_info=True)
+        log_connection_stats("update_cleaner_ranking")
+        log_pool_stats("update_cleaner_ranking")
 
 
 if __name__ == "__main__":
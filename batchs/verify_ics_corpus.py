@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""ICS fast path 차등 검증 스크립트.
+
+``ics_corpus/``의 익명화된 ICS 샘플로 스트리밍 추출기(``parse_vevents_fast``)와
+icalendar 경로(``_parse_with_icalendar``)의 결과가 같은지 확인한다(DB 접속 없음).
+
+- 일반 파일: fast path가 직접 처리해야 하며 결과가 icalendar와 같아야 한다.
+- ``fallback_*`` 파일: VTIMEZONE 정의, 중복 DTSTART, BOM, Windows TZID처럼 fast path가
+  ``IcsFastPathUnsupported``로 icalendar에 넘겨야 하는 입력이다. 넘긴 뒤의 최종
+  파싱 결과도 icalendar와 같아야 한다.
+
+사용법: ``python batchs/verify_ics_corpus.py [코퍼스 폴더]`` (실패 시 exit 1)
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from pathlib import Path
+from typing import List
+
+from db_forecasting import (
+    IcsFastPathUnsupported,
+    _parse_ics_uncached,
+    _parse_with_icalendar,
+    parse_vevents_fast,
+)
+
+CORPUS_DIR = Path(__file__).resolve().parent / "ics_corpus"
+FALLBACK_PREFIX = "fallback_"
+
+
+def verify_corpus(corpus: Path) -> List[str]:
+    """코퍼스 전체를 검증하고 실패 사유 목록을 돌려준다."""
+
+    paths = sorted(corpus.glob("*.ics"))
+    if not paths:
+        return [f"{corpus}: ICS 샘플이 없습니다"]
+
+    failures: List[str] = []
+    for path in paths:
+        data = path.read_bytes()
+        expected = _parse_with_icalendar(data, str(path))
+        if not expected:
+            failures.append(f"{path.name}: icalendar 결과가 비어 있어 비교할 수 없음")
+            continue
+        if path.name.startswith(FALLBACK_PREFIX):
+            try:
+                parse_vevents_fast(data, str(path))
+            except IcsFastPathUnsupported as exc:
+                logging.info("%s: fast path → icalendar (%s)", path.name, exc)
+            else:
+                failures.append(f"{path.name}: fast path가 icalendar로 넘기지 않음")
+            actual = _parse_ics_uncached(data, str(path))
+        else:
+            try:
+                actual = parse_vevents_fast(data, str(path))
+            except IcsFastPathUnsupported as exc:
+                failures.append(f"{path.name}: fast path 미지원({exc})")
+                continue
+        if actual != expected:
+            failures.append(
+                f"{path.name}: 결과 불일치(fast={actual}, icalendar={expected})"
+            )
+    logging.info("ICS 코퍼스 검증: %s건, 실패 %s건", len(paths), len(failures))
+    return failures
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    corpus = Path(sys.argv[1]) if len(sys.argv) > 1 else CORPUS_DIR
+    failures = verify_corpus(corpus)
+    for failure in failures:
+        logging.error(failure)
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()